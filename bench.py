@@ -0,0 +1,130 @@
+# /// script
+# dependencies = [
+#   "bibtexparser",
+#   "jinja2",
+#   "markdown",
+#   "pillow",
+#   "brotli",
+# ]
+# ///
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+GEN_PATH = os.path.join(REPO_DIR, 'gen.py')
+PREVIEW_DIR = os.path.join(REPO_DIR, 'assets', 'img', 'publication_preview')
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+
+# Venue macros, so the parser has @string expansion to do like in the real bibtex.bib
+VENUES = {
+    'cvpr': 'Conference on Computer Vision and Pattern Recognition (CVPR)',
+    'iccv': 'International Conference on Computer Vision (ICCV)',
+    'nips': 'Advances in neural information processing systems (NeurIPS)',
+    'icml': 'International Conference on Machine Learning (ICML)',
+    'tmlr': 'Transactions on Machine Learning Research (TMLR)',
+}
+# Names with LaTeX accents exercise convert_to_unicode
+FIRST_NAMES = ['Alexander', 'Lucas', 'Xiaohua', 'Andr{\\\'e}', 'Ji{\\v{r}}{\\\'\\i}', 'J{\\"u}rgen', 'Fran{\\c{c}}ois', 'Maria']
+LAST_NAMES = ['Kolesnikov', 'Beyer', 'Zhai', 'Pinto', 'M{\\"u}ller', 'Dvo{\\v{r}}{\\\'a}k', 'Tschannen', 'Houlsby', 'Puigcerver']
+WORDS = ['scaling', 'vision', 'transformers', 'representation', 'learning', 'self-supervised', 'generative',
+         'models', 'images', 'text', 'efficient', 'robust', 'transfer', 'large', 'data']
+
+# Function to write a synthetic bib file with `size` entries. Returns its size in bytes.
+def write_synthetic_bib(path, size, seed=0):
+    rng = random.Random(seed)
+    previews = sorted(os.listdir(PREVIEW_DIR)) if os.path.isdir(PREVIEW_DIR) else []
+    with open(path, 'w', encoding='utf-8') as f:
+        for macro, venue in VENUES.items():
+            f.write(f"@string{{{macro} = {{{venue}}}}}\n")
+        for i in range(size):
+            authors = [f"{rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)}" for _ in range(rng.randint(1, 8))]
+            if rng.random() < 0.1:
+                authors.append('others')
+            if rng.random() < 0.2:
+                authors.insert(rng.randrange(len(authors)), 'Kolesnikov, Alexander')
+            f.write(f"\n@inproceedings{{synthetic{i},\n")
+            if rng.random() < 0.05:
+                f.write("  selected={true},\n")
+            if previews and rng.random() < 0.3:
+                f.write(f"  preview={{{rng.choice(previews)}}},\n")
+            arxiv = f"{rng.randint(17, 25):02d}{rng.randint(1, 12):02d}.{rng.randint(0, 99999):05d}"
+            f.write(f"  arxiv={{{arxiv}}},\n")
+            f.write(f"  pdf={{https://arxiv.org/pdf/{arxiv}.pdf}},\n")
+            f.write(f"  title={{{' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))).capitalize()}}},\n")
+            f.write(f"  author={{{' and '.join(authors)}}},\n")
+            f.write(f"  booktitle={rng.choice(list(VENUES))},\n")
+            f.write(f"  year={{{2025 - i * 20 // max(size, 1)}}}\n")
+            f.write("}\n")
+    return os.path.getsize(path)
+
+# Function to run gen.py with --profile in `site_dir` and collect its report
+def run_profiled_build(site_dir, gen_args):
+    report_path = os.path.join(site_dir, 'profile.json')
+    start = time.perf_counter()
+    subprocess.run([sys.executable, GEN_PATH, '--profile', report_path, *gen_args], cwd=site_dir,
+                   check=True, stdout=subprocess.DEVNULL)
+    wall_seconds = time.perf_counter() - start
+    with open(report_path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    os.remove(report_path)
+    # The process wall time also covers interpreter start-up and imports, which the profiler does not see
+    return {'process_seconds': wall_seconds, **report}
+
+# Function to benchmark a cold build and, with --incremental, a warm rebuild for one synthetic bib size
+def benchmark_size(size, gen_args, seed):
+    with tempfile.TemporaryDirectory(prefix='gen-bench-') as site_dir:
+        if os.path.isdir(PREVIEW_DIR):
+            shutil.copytree(PREVIEW_DIR, os.path.join(site_dir, 'assets', 'img', 'publication_preview'))
+        bib_bytes = write_synthetic_bib(os.path.join(site_dir, 'bibtex.bib'), size, seed)
+        runs = {'cold': run_profiled_build(site_dir, gen_args)}
+        if '--incremental' in gen_args:
+            runs['warm'] = run_profiled_build(site_dir, gen_args)
+        return [{'entries': size, 'bib_bytes': bib_bytes, 'run': run, **report} for run, report in runs.items()]
+
+# Main function to benchmark gen.py on synthetic bib files of increasing size
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Benchmark gen.py on synthetic bib files and report per-stage time and peak memory as JSON. "
+                    "Arguments after '--' are passed to gen.py.")
+    arg_parser.add_argument('--sizes', type=lambda value: [int(size) for size in value.split(',')],
+                            default=list(DEFAULT_SIZES), metavar='N,N,...',
+                            help="Numbers of entries to benchmark (default: %(default)s).")
+    arg_parser.add_argument('--seed', type=int, default=0, help="Seed for the synthetic bib files.")
+    arg_parser.add_argument('-o', '--output', metavar='PATH', help="Write the results to PATH instead of stdout.")
+    arg_parser.add_argument('gen_args', nargs=argparse.REMAINDER, help="Extra gen.py flags, e.g. -- --incremental.")
+    args = arg_parser.parse_args()
+    gen_args = args.gen_args[1:] if args.gen_args[:1] == ['--'] else args.gen_args
+
+    results = []
+    for size in args.sizes:
+        for result in benchmark_size(size, gen_args, args.seed):
+            print(f"{size} entries ({result['run']}): {result['total_seconds']:.2f} s, "
+                  f"peak {result['peak_bytes'] / (1 << 20):.1f} MiB", file=sys.stderr)
+            results.append(result)
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'gen_args': gen_args,
+        'seed': args.seed,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
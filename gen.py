@@ -3,46 +3,131 @@
 #   "bibtexparser",
 #   "jinja2", 
 #   "markdown",
+#   "pillow",
+#   "brotli",
 # ]
 # ///
 
-import bibtexparser
-from bibtexparser.bparser import BibTexParser
-from jinja2 import Template
-from io import StringIO
-import markdown
+import argparse
+import contextlib
+import functools
+import gzip
+import hashlib
+import heapq
+import html
+import importlib
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import unicodedata
+import urllib.parse
 from datetime import datetime
 
-# Function to read the BibTeX string and parse it
-def read_bibtex_string(bibtex_string):
-    bibtex_file = StringIO(bibtex_string)
-    parser = BibTexParser()
-    parser.customization = bibtexparser.customization.convert_to_unicode
-    bib_database = bibtexparser.load(bibtex_file, parser=parser)
-
-    # Adapt author names to "First name Last name" format, but keep original authors for citation
-    for entry in bib_database.entries:
-        if 'author' in entry:
-            entry['original_author'] = entry['author']
-            authors = entry['author'].split(' and ')
-            formatted_authors = []
-            for author in authors:
-                names = author.split(', ')
-                if len(names) == 2:
-                    formatted_author = f"{names[1]} {names[0]}"
-                    # Bold Alexander Kolesnikov's name
-                    if 'Alexander Kolesnikov' in formatted_author:
-                        formatted_author = f"<b>{formatted_author}</b>"
-                    formatted_authors.append(formatted_author)
-                else:
-                    formatted_authors.append(author)
-            entry['author'] = ', '.join(formatted_authors)
-    return bib_database.entries
-
-# Function to create an HTML page from the parsed BibTeX data and save it
-def create_html(entries):
-    # Convert the About Me section from Markdown to HTML
-    about_markdown = """
+# Separators of BibTeX author lists ("A and B") and of the parts of a name ("Last, First")
+AUTHOR_SEPARATOR = re.compile(r'\s+and\s+', re.IGNORECASE)
+NAME_PART_SEPARATOR = re.compile(r'\s*,\s*')
+WHITESPACE = re.compile(r'\s+')
+
+# Server-sent events endpoint of the --watch dev server, and how often it polls for changed files (in seconds)
+LIVE_RELOAD_PATH = '/__reload'
+WATCH_INTERVAL = 0.1
+
+# arXiv identifiers (new-style 2503.19786v2 or old-style hep-th/9901001), references to them in other fields
+# ("arXiv:2503.19786", arxiv.org/abs/... and arxiv.org/pdf/... links) and their version suffix
+ARXIV_ID = re.compile(r'(\d{4}\.\d{4,5}|[a-z-]+(\.[A-Z]{2})?/\d{7})(v\d+)?')
+ARXIV_REFERENCE = re.compile(r'(?:arxiv:\s*|arxiv\.org/(?:abs|pdf)/)(\d{4}\.\d{4,5}(?:v\d+)?|[a-z-]+(?:\.[A-Z]{2})?/\d{7})', re.IGNORECASE)
+ARXIV_VERSION = re.compile(r'v\d+$')
+
+# Every publication as BibTeX, relative to the site root
+PUBLICATIONS_BIB_PATH = 'publications.bib'
+
+# Crawler and feed reader outputs, relative to the site root. The feed lists the FEED_SIZE latest publications.
+SITEMAP_PATH = 'sitemap.xml'
+FEED_PATH = 'feed.xml'
+FEED_SIZE = 50
+
+# Outputs of the non-HTML renderers (--formats), relative to the site root, and how many parsed records may
+# wait for a renderer running on a worker thread
+PUBLICATIONS_JSON_PATH = 'publications.json'
+PUBLICATIONS_MARKDOWN_PATH = 'publications.md'
+PUBLICATIONS_LATEX_PATH = 'publications.tex'
+RENDER_QUEUE_SIZE = 1024
+
+# Characters LaTeX treats specially, with how to write them in text
+LATEX_SPECIAL_CHARACTERS = {'\\': r'\textbackslash{}', '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
+                            '{': r'\{', '}': r'\}', '~': r'\textasciitilde{}', '^': r'\textasciicircum{}'}
+
+# Service worker (--service-worker) and the manifest of files it precaches, relative to the site root. The
+# worker stays at the root so it controls every page.
+SERVICE_WORKER_PATH = 'sw.js'
+PRECACHE_MANIFEST_PATH = 'precache-manifest.json'
+# First line of every service worker gen.py writes, so a worker it did not write is never replaced
+SERVICE_WORKER_HEADER = '// Generated by gen.py'
+
+# Order of the common fields in exported BibTeX
+BIBTEX_FIELD_ORDER = ('title', 'author', 'editor', 'journal', 'booktitle', 'volume', 'number', 'pages', 'publisher',
+                      'year', 'month')
+
+# Fields that only configure this site and are left out of exported BibTeX, and fields holding URLs or
+# identifiers whose characters are written as they are
+BIBTEX_SITE_FIELDS = {'selected', 'preview'}
+BIBTEX_VERBATIM_FIELDS = {'url', 'pdf', 'code', 'doi', 'eprint', 'arxiv', 'file'}
+
+# Name prefix of the temporary directories outputs are staged in until a build succeeds
+STAGING_PREFIX = '.gen-staging-'
+
+# Words left out of the search index, since nearly every title has them
+SEARCH_STOPWORDS = {'a', 'an', 'and', 'are', 'as', 'at', 'by', 'for', 'from', 'in', 'is', 'of', 'on', 'the', 'to',
+                    'via', 'with'}
+
+# Directory holding the build cache (input hashes, per-entry fragments and compiled templates)
+CACHE_DIR = '.gen_cache'
+
+# External link checks (--check): results file in the cache directory, how long a working link is trusted,
+# how many requests run at once, seconds between requests to one host, and per-request timeout and redirects
+LINK_CACHE_NAME = 'links.json'
+LINK_TTL = 24 * 60 * 60
+LINK_CONCURRENCY = 8
+LINK_INTERVAL = 0.5
+LINK_TIMEOUT = 15
+LINK_MAX_REDIRECTS = 5
+LINK_USER_AGENT = 'gen.py link checker'
+
+# Directory holding the page layout and its partials (header, selected grid, entry, footer)
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# Directory, relative to the site root, for publication pages split off index.html by --page-size
+SHARD_DIR = 'publications'
+
+# Where --optimize writes the deferred, below-the-fold stylesheet, relative to the site root
+SITE_CSS_PATH = 'assets/css/site.css'
+
+# Manifest written by --publish, mapping static asset URLs to their content-hashed copies, and the directory the
+# copies are written to, mirroring the paths of their originals. Keeping them apart from the originals keeps
+# build outputs out of input directories such as PREVIEW_DIR.
+ASSET_MANIFEST_PATH = 'asset-manifest.json'
+HASHED_ASSET_DIR = 'assets/hashed'
+
+# Outputs that --publish precompresses into .gz and .br siblings
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.xml', '.txt', '.svg', '.bib')
+
+# Publication preview images, relative to the site root, and where resized copies of them are written
+PREVIEW_DIR = 'assets/img/publication_preview'
+RESIZED_PREVIEW_DIR = 'assets/img/publication_preview_resized'
+
+# Widths of the resized previews: cards and entry previews are shown about 300px wide, so 1x and 2x
+PREVIEW_WIDTHS = (320, 640)
+
+# The About Me section, in Markdown
+ABOUT_MARKDOWN = """
 I am a machine learning researcher focused on advancing deep learning, with a particular interest in multimodal intelligence. Currently, I am working as a member of technical staff at OpenAI, where I contribute to multimodal AI research.
 
 Throughout my career, I've had the opportunity to work on various aspects of computer vision and machine learning. This includes contributing to vision model development (ImageNet state-of-the-art results in [2019](https://arxiv.org/abs/1912.11370), [2020](https://arxiv.org/abs/2010.11929), and [2021](https://arxiv.org/abs/2106.04560)) and developing open models like [SigLIP](https://arxiv.org/abs/2303.15343) and [PaliGemma](https://github.com/google-research/big_vision/blob/main/big_vision/configs/proj/paligemma/README.md). I've also worked on neural architectures including [BiT](https://arxiv.org/abs/1912.11370), [ViT](https://arxiv.org/abs/2010.11929), [MLP-Mixer](https://arxiv.org/abs/2105.01601), and [FlexiViT](https://arxiv.org/abs/2212.08013). My recent work has focused on making multimodal deep learning more accessible and scalable through projects like [UViM](https://arxiv.org/abs/2205.10337), [Vision with Rewards](https://arxiv.org/abs/2302.08242), and [JetFormer](https://arxiv.org/abs/2411.19722).
@@ -53,506 +138,2118 @@ Before joining OpenAI, I was at Google Brain (now Google DeepMind). I completed
 
 You can reach me at `a@kolesnikov.ch`.
 """
-    about_html = markdown.markdown(about_markdown)
-
-    # Separate selected entries
-    selected_entries = [entry for entry in entries if entry.get('selected', '').lower() == 'true']
-
-    # A simple HTML template using Jinja2 syntax
-    html_template = """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Personal Page of Alexander Kolesnikov</title>
-        <link href="https://fonts.googleapis.com/css2?family=Plus+Jakarta+Sans:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-        <style>
-            :root {
-                --primary-color: #2563eb;
-                --text-primary: #1a1a1a;
-                --text-secondary: #4b5563;
-                --bg-primary: #ffffff;
-                --bg-secondary: #f8fafc;
-                --shadow-sm: 0 1px 3px rgba(0,0,0,0.08);
-                --shadow-md: 0 4px 12px rgba(0,0,0,0.05);
-                --shadow-lg: 0 20px 25px -5px rgba(0,0,0,0.05);
-                --gradient-primary: linear-gradient(135deg, #2563eb, #4f46e5);
-            }
-
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-
-            body {
-                font-family: 'Plus Jakarta Sans', -apple-system, BlinkMacSystemFont, sans-serif;
-                line-height: 1.7;
-                max-width: 1100px;
-                margin: 0 auto;
-                padding: 3rem 2rem;
-                background-color: var(--bg-secondary);
-                color: var(--text-primary);
-                font-size: 1rem;
-                letter-spacing: -0.01em;
-            }
-
-            .header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 4rem;
-                padding: 3rem;
-                background: var(--bg-primary);
-                border-radius: 1.5rem;
-                box-shadow: var(--shadow-lg);
-                position: relative;
-                overflow: hidden;
-            }
-
-            .header::before {
-                content: '';
-                position: absolute;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 5px;
-                background: var(--gradient-primary);
-            }
-
-            .header-left {
-                flex: 1;
-            }
-
-            .name {
-                font-size: 2.5rem;
-                font-weight: 700;
-                margin: 0;
-                background: var(--gradient-primary);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                letter-spacing: -0.03em;
-            }
-
-            .title {
-                font-size: 1.2rem;
-                color: var(--text-secondary);
-                margin: 0.7rem 0;
-                font-weight: 500;
-            }
-
-            .profile-img {
-                width: 180px;
-                height: 180px;
-                border-radius: 1.5rem;
-                object-fit: cover;
-                margin-left: 3rem;
-                box-shadow: var(--shadow-lg);
-                transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-                border: 4px solid var(--bg-primary);
-            }
-
-            .profile-img:hover {
-                transform: scale(1.05) rotate(2deg);
-            }
-
-            .about {
-                font-size: 1.05rem;
-                color: var(--text-primary);
-                background: var(--bg-primary);
-                border-radius: 1.5rem;
-                padding: 3rem;
-                margin-bottom: 4rem;
-                box-shadow: var(--shadow-lg);
-                line-height: 1.8;
-                text-align: justify;
-                position: relative;
-            }
-
-            .about a {
-                color: var(--primary-color);
-                text-decoration: none;
-                font-weight: 600;
-                transition: all 0.2s ease;
-                padding-bottom: 1px;
-                border-bottom: 2px solid transparent;
-            }
-
-            .about a:hover {
-                border-bottom: 2px solid var(--primary-color);
-            }
-
-            h1 {
-                font-size: 2rem;
-                font-weight: 700;
-                margin: 3rem 0 2rem;
-                color: var(--text-primary);
-                position: relative;
-                padding-bottom: 0.7rem;
-                letter-spacing: -0.02em;
-            }
-
-            h1::after {
-                content: '';
-                position: absolute;
-                bottom: 0;
-                left: 0;
-                width: 70px;
-                height: 5px;
-                background: var(--gradient-primary);
-                border-radius: 3px;
-            }
-
-            .selected-publications-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
-                gap: 2rem;
-                margin-bottom: 4rem;
-            }
-
-            .selected-publication-card {
-                background: var(--bg-primary);
-                border-radius: 1.2rem;
-                overflow: hidden;
-                box-shadow: var(--shadow-lg);
-                transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-                border: 1px solid rgba(0,0,0,0.05);
-            }
-
-            .selected-publication-card:hover {
-                transform: translateY(-8px);
-                box-shadow: var(--shadow-lg), 0 25px 50px -12px rgba(0,0,0,0.1);
-            }
-
-            .selected-publication-card img {
-                width: 100%;
-                height: 200px;
-                object-fit: cover;
-                background: #f8f8f8;
-                padding: 1rem;
-                transition: all 0.3s ease;
-            }
-
-            .selected-publication-card:hover img {
-                transform: scale(1.05);
-            }
-
-            .selected-publication-card p {
-                padding: 1.5rem;
-                font-size: 1rem;
-                color: var(--text-primary);
-                font-weight: 500;
-            }
-
-            .entry {
-                background: var(--bg-primary);
-                border-radius: 1.2rem;
-                padding: 2rem;
-                margin-bottom: 2rem;
-                box-shadow: var(--shadow-lg);
-                display: flex;
-                gap: 3rem;
-                transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-                border: 1px solid rgba(0,0,0,0.05);
-            }
-
-            .entry:hover {
-                transform: translateX(8px);
-                box-shadow: var(--shadow-lg), 0 20px 40px -12px rgba(0,0,0,0.1);
-            }
-
-            .entry-content {
-                flex: 1;
-            }
-
-            .entry-title {
-                font-size: 1.25rem;
-                font-weight: 700;
-                color: var(--text-primary);
-                margin-bottom: 1.2rem;
-                line-height: 1.4;
-            }
 
-            .author, .year, .journal {
-                color: var(--text-secondary);
-                margin-bottom: 0.7rem;
-                font-size: 1rem;
-            }
-
-            .links {
-                display: flex;
-                gap: 1rem;
-                margin-top: 1.5rem;
-                flex-wrap: wrap;
-            }
-
-            .links a, .cite-button {
-                padding: 0.6rem 1.2rem;
-                border-radius: 0.8rem;
-                text-decoration: none;
-                font-weight: 600;
-                transition: all 0.3s ease;
-                font-size: 0.95rem;
-            }
-
-            .links a {
-                background: #e0e7ff;
-                color: var(--primary-color);
-            }
-
-            .links a:hover {
-                background: #c7d2fe;
-                transform: translateY(-2px);
-            }
-
-            .cite-button {
-                background: var(--gradient-primary);
-                color: white;
-                border: none;
-                cursor: pointer;
-            }
-
-            .cite-button:hover {
-                opacity: 0.9;
-                transform: translateY(-2px);
-            }
-
-            .citation-text {
-                margin-top: 1.5rem;
-                padding: 1.5rem;
-                background: var(--bg-secondary);
-                border-radius: 1rem;
-                font-family: 'SF Mono', Consolas, Monaco, monospace;
-                font-size: 0.9rem;
-                display: none;
-                border: 1px solid rgba(0,0,0,0.1);
-            }
-
-            .preview img {
-                max-width: 280px;
-                border-radius: 1rem;
-                box-shadow: var(--shadow-md);
-                transition: all 0.3s ease;
-            }
-
-            .preview img:hover {
-                transform: scale(1.05);
-            }
-
-            .footer {
-                margin-top: 5rem;
-                padding: 3rem;
-                background: var(--bg-primary);
-                border-radius: 1.5rem;
-                box-shadow: var(--shadow-lg);
-                text-align: center;
-                color: var(--text-secondary);
-                font-size: 0.95rem;
-                position: relative;
-            }
-
-            .footer::after {
-                content: '';
-                position: absolute;
-                bottom: 0;
-                left: 0;
-                width: 100%;
-                height: 5px;
-                background: var(--gradient-primary);
-                border-bottom-left-radius: 1.5rem;
-                border-bottom-right-radius: 1.5rem;
-            }
+# Who the page is about; batch jobs can override any of these in their profile config
+DEFAULT_PROFILE = {
+    'name': 'Alexander Kolesnikov',
+    'title': 'Member of Technical Staff at OpenAI',
+    'image': '/assets/img/profile.jpg',
+}
+
+# Build options shared by single-page and batch builds
+DEFAULT_OPTIONS = {
+    # Reuse unchanged work from the build cache
+    'incremental': False,
+    # Serve previews as resized AVIF/WebP with srcset and intrinsic dimensions
+    'responsive_images': False,
+    # Keep only this many entries in index.html and move the rest to shard pages (None keeps all)
+    'page_size': None,
+    # Split the remaining entries into one page per 'year' or into pages of 'size' entries
+    'shard_by': 'year',
+    # Write citations to citations.json, fetched when a Cite button is first clicked, instead of inlining them
+    'lazy_citations': False,
+    # Minify HTML/CSS/JS, inline only critical.css and load site.css and the web fonts without blocking rendering
+    'optimize': False,
+    # Write a prebuilt search index to search.json and add search and filters above the publications
+    'search': False,
+    # Reference static assets by content-hashed copies and precompress text outputs with gzip and brotli
+    'publish': False,
+    # Write a service worker that precaches the pages, styles and data files and caches images for offline use
+    'service_worker': False,
+    # Outputs to render from the parsed bib file, by RENDERERS name
+    'formats': ['html'],
+}
+
+# Records wall time and peak traced memory per build stage for --profile. Time is exclusive: while a nested
+# stage runs, the enclosing one is paused, so stage times add up to the profiled total. Only the main thread's
+# stages are recorded, so renderers running on worker threads (--formats) are not broken down.
+# Tracing memory slows down allocation-heavy stages such as parse, so compare profiled runs with each other.
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.stages = {}
+        self.stack = []
+        self.started = None
+
+    # Function to start profiling, tracing memory allocations from here on
+    def start(self):
+        self.enabled = True
+        tracemalloc.start()
+        self.begin = time.perf_counter()
+        self.started = self.begin
+
+    # Function to charge the time and peak memory since the last switch to the innermost running stage
+    def pause(self):
+        if self.stack:
+            stats = self.stages[self.stack[-1]]
+            stats['seconds'] += time.perf_counter() - self.started
+            stats['peak_bytes'] = max(stats['peak_bytes'], tracemalloc.get_traced_memory()[1])
+
+    def resume(self):
+        tracemalloc.reset_peak()
+        self.started = time.perf_counter()
+
+    # Stages on other threads are not timed; they overlap with the main thread's stages
+    @contextlib.contextmanager
+    def stage(self, name):
+        if not self.enabled or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+        self.pause()
+        self.stack.append(name)
+        stats = self.stages.setdefault(name, {'seconds': 0.0, 'peak_bytes': 0, 'calls': 0})
+        stats['calls'] += 1
+        self.resume()
+        try:
+            yield
+        finally:
+            self.pause()
+            self.stack.pop()
+            self.resume()
+
+    # Function to stop profiling and get the results as a JSON-serializable report
+    def report(self):
+        total_seconds = time.perf_counter() - self.begin
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.enabled = False
+        return {
+            'total_seconds': total_seconds,
+            'peak_bytes': max([peak_bytes] + [stats['peak_bytes'] for stats in self.stages.values()]),
+            'stages': self.stages,
+        }
+
+# The profiler used by all stages; enabled by --profile
+PROFILER = Profiler()
+
+# Seconds spent importing each heavy module, reported by --verbose
+IMPORT_TIMES = {}
+
+# Function to import a heavy module only when a build stage needs it, so runs that find the page up to date
+# never pay for bibtexparser, jinja2 or markdown
+def lazy_import(name):
+    module = sys.modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        with PROFILER.stage('imports'):
+            module = importlib.import_module(name)
+        IMPORT_TIMES[name] = time.perf_counter() - start
+    return module
+
+# Function to hash build inputs for the incremental cache
+def content_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+# Function to hash a file without reading it into memory at once
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Function to hash this script, so cached work produced by an older version of the generator is not reused.
+# --watch restarts the process when the script changes, so hashing it once per process is enough.
+@functools.lru_cache(maxsize=None)
+def generator_hash():
+    return file_hash(os.path.abspath(__file__))
+
+# Function to hash all template files, so editing any layout, partial or stylesheet invalidates the cache
+def template_hash():
+    digest = hashlib.sha256()
+    for root, dirs, files in sorted(os.walk(TEMPLATE_DIR)):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, TEMPLATE_DIR).encode('utf-8'))
+            digest.update(file_hash(path).encode('utf-8'))
+    return digest.hexdigest()
+
+# Function to minify CSS: drops comments and the whitespace around punctuation
+def minify_css(css, enabled=True):
+    if not enabled:
+        return css
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+# Function to minify JavaScript conservatively: drops indentation, blank lines and whole-line comments
+# but keeps line breaks, so code relying on automatic semicolon insertion still works
+def minify_js(js, enabled=True):
+    if not enabled:
+        return js
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+# Tags whose content must reach the browser untouched by minify_html()
+RAW_HTML_TAG = re.compile(r'<(pre|textarea|script|style)\b', re.I)
+
+# Function to collapse formatting whitespace in HTML text outside of raw tags. `before_tag` says the text
+# is directly followed by a tag, so trailing formatting whitespace can go too.
+def collapse_html_whitespace(html, before_tag=False):
+    html = re.sub(r'<!--.*?-->', '', html, flags=re.S)
+    html = re.sub(r'>\s*\n\s*<', '><', html)
+    if before_tag:
+        html = re.sub(r'\s*\n\s*$', '', html)
+    html = re.sub(r'\s*\n\s*', '\n', html)
+    return re.sub(r'[ \t]{2,}', ' ', html)
+
+# Function to minify streamed HTML chunk by chunk. Text is only processed up to the last tag end, which is
+# kept for the next chunk, and
+# <pre>, <textarea>, <script> and <style> blocks are passed through whole, so no chunk boundary can change
+# the result; inline scripts and styles are minified by their own template filters.
+def minify_html(chunks):
+    pending = ''
+    for chunk in itertools.chain(chunks, [None]):
+        final = chunk is None
+        pending += chunk or ''
+        output = []
+        while pending:
+            raw = RAW_HTML_TAG.search(pending)
+            if raw is None:
+                cut = len(pending) if final else max(pending.rfind('>'), 0)
+                output.append(collapse_html_whitespace(pending[:cut]))
+                pending = pending[cut:]
+                break
+            end = pending.find(f"</{raw.group(1)}", raw.end())
+            output.append(collapse_html_whitespace(pending[:raw.start()], before_tag=True))
+            pending = pending[raw.start():]
+            if end == -1 and not final:
+                break
+            end = len(pending) if end == -1 else end - raw.start()
+            # Scripts and styles are already minified; only the indentation before their closing tag goes
+            raw_block = pending[:end]
+            output.append(raw_block if raw.group(1).lower() in ('pre', 'textarea') else raw_block.rstrip())
+            pending = pending[end:]
+        if output:
+            yield ''.join(output)
+
+# Function to load a compiled template
+def load_template(name):
+    with PROFILER.stage('templates'):
+        return get_environment().get_template(name)
+
+# Function to get the shared Jinja2 environment. Compiled templates are kept in memory for the rest of
+# the process and as bytecode in the build cache, so later runs skip lexing, parsing and compiling.
+@functools.lru_cache(maxsize=None)
+def get_environment():
+    bytecode_dir = os.path.abspath(os.path.join(CACHE_DIR, 'jinja'))
+    os.makedirs(bytecode_dir, exist_ok=True)
+    jinja2 = lazy_import('jinja2')
+    environment = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(bytecode_dir),
+        keep_trailing_newline=True,
+    )
+    environment.filters['minify_css'] = minify_css
+    environment.filters['minify_js'] = minify_js
+    environment.filters['escape_markdown'] = escape_markdown
+    environment.filters['escape_markdown_url'] = escape_markdown_url
+    environment.filters['escape_latex'] = escape_latex
+    environment.filters['escape_latex_url'] = escape_latex_url
+    return environment
+
+# Function to create an empty build cache: the inputs and output hashes of the last build, for the page and
+# per renderer. It stays small whatever the size of the bib file, so checking whether a build is up to date is cheap.
+def empty_build_cache():
+    return {'inputs': {}, 'outputs': {}, 'renderers': {}}
+
+# Function to create empty build data: the work a build can reuse (About Me HTML, entry fragments, normalized
+# records and precache revisions). It grows with the bib file, so it is kept in a file of its own and only
+# loaded once something needs rendering.
+def empty_build_data():
+    return {'about_hash': None, 'about_html': None, 'fragments': {}, 'records': {}, 'revisions': {}}
+
+# Function to locate the build cache of an output file, or with `suffix` '-data' its build data.
+# Each output file gets its own cache, so batch jobs do not evict each other's fragments.
+def build_cache_path(output_path, cache_dir=CACHE_DIR, suffix=''):
+    return os.path.join(cache_dir, f"build-{content_hash(os.path.abspath(output_path))[:16]}{suffix}.json")
+
+# Function to load one part of the build cache, keeping only the keys of `empty` and starting fresh if it is
+# missing or unreadable
+def load_build_part(path, empty):
+    with PROFILER.stage('cache'):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                part = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            part = {}
+    return {key: part.get(key, value) for key, value in empty.items()}
+
+# Function to load the build cache without its build data
+def load_build_cache(output_path, cache_dir=CACHE_DIR):
+    return load_build_part(build_cache_path(output_path, cache_dir), empty_build_cache())
+
+# Function to load the build data into a loaded build cache, once a build needs to render
+def load_build_data(cache, output_path, cache_dir=CACHE_DIR):
+    cache.update(load_build_part(build_cache_path(output_path, cache_dir, '-data'), empty_build_data()))
+
+# Function to persist the build cache, and with `with_data` its build data
+def save_build_cache(cache, output_path, cache_dir=CACHE_DIR, with_data=False):
+    with PROFILER.stage('cache'):
+        os.makedirs(cache_dir, exist_ok=True)
+        # The data goes first, so the cache never lists outputs whose fragments were not saved
+        parts = [('-data', empty_build_data())] if with_data else []
+        for suffix, empty in parts + [('', empty_build_cache())]:
+            path = build_cache_path(output_path, cache_dir, suffix)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump({key: cache[key] for key in empty}, f)
+            os.replace(path + '.tmp', path)
+
+# Function to fingerprint a directory by file names, sizes and modification times, without reading the files
+def directory_fingerprint(path):
+    digest = hashlib.sha256()
+    for root, dirs, files in sorted(os.walk(path)):
+        dirs.sort()
+        for name in sorted(files):
+            stat = os.stat(os.path.join(root, name))
+            digest.update(f"{os.path.relpath(os.path.join(root, name), path)}:{stat.st_size}:{stat.st_mtime_ns}\0".encode('utf-8'))
+    return digest.hexdigest()
+
+# Function to get the absolute URL the site is served at, without a trailing slash: the profile's "url", or
+# https:// and the domain in the site's CNAME file. Returns None if neither is set.
+def public_site_url(site_dir, profile):
+    if profile.get('url'):
+        return profile['url'].rstrip('/')
+    try:
+        with open(os.path.join(site_dir, 'CNAME'), 'r', encoding='utf-8') as f:
+            domain = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return f"https://{domain}" if domain else None
+
+# Function to hash the inputs that determine the generated page
+def build_inputs(bib_path, about_markdown=ABOUT_MARKDOWN, profile=DEFAULT_PROFILE, options=DEFAULT_OPTIONS, site_dir='.'):
+    inputs = {
+        'bib': file_hash(bib_path),
+        'about': content_hash(about_markdown),
+        'profile': content_hash(json.dumps(profile, sort_keys=True)),
+        # Other formats have inputs of their own, so selecting them does not invalidate the page
+        'options': content_hash(json.dumps({name: value for name, value in options.items() if name != 'formats'}, sort_keys=True)),
+        'template': template_hash(),
+        'generator': generator_hash(),
+    }
+    site_url = public_site_url(site_dir, profile)
+    if site_url:
+        inputs['site_url'] = content_hash(site_url)
+    # Resized previews and the service worker's image revisions follow the files in the preview directory
+    if options['responsive_images'] or options['service_worker']:
+        inputs['previews'] = directory_fingerprint(os.path.join(site_dir, PREVIEW_DIR))
+    return inputs
+
+# Collects a build's output files (pages, shards, data files, asset copies and their compressed siblings) in a
+# staging directory next to them, then publishes the whole tree at once. Files whose content hash matches the
+# live file are dropped from staging, so their mtimes stay put; changed files are moved in with atomic renames,
+# assets and data before the pages that reference them, and stale files are deleted last. Nothing in the live
+# tree changes unless commit() is reached; discard() always cleans up the staging directory.
+class OutputTree:
+    def __init__(self, site_dir):
+        # Staging on the same file system as the site keeps the final renames atomic
+        os.makedirs(site_dir, exist_ok=True)
+        self.staging_dir = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=site_dir)
+        self.staged_files = itertools.count()
+        self.staged = {}
+        self.hashes = {}
+        self.removals = set()
+
+    # Function to stage streamed text chunks for `path`. Returns whether the content differs from the live
+    # file and its hash.
+    def write(self, path, chunks):
+        digest = hashlib.sha256()
+        staged_path = self.staging_path(path)
+        with open(staged_path, 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                with PROFILER.stage('write'):
+                    digest.update(chunk.encode('utf-8'))
+                    f.write(chunk)
+        return self.stage(path, staged_path, digest.hexdigest())
+
+    # Function to stage bytes for `path`, like write()
+    def write_bytes(self, path, data):
+        staged_path = self.staging_path(path)
+        with open(staged_path, 'wb') as f:
+            f.write(data)
+        return self.stage(path, staged_path, hashlib.sha256(data).hexdigest())
+
+    # Function to stage a copy of an existing file for `path`, like write()
+    def copy(self, source, path):
+        staged_path = self.staging_path(path)
+        shutil.copyfile(source, staged_path)
+        return self.stage(path, staged_path, file_hash(staged_path))
+
+    # Function to get the file that holds the content `path` will have once the tree is committed
+    def source(self, path):
+        return self.staged.get(path, path)
+
+    # Function to read the content `path` will have once the tree is committed
+    def read(self, path):
+        with open(self.source(path), 'rb') as f:
+            return f.read()
+
+    # Function to delete `path` from the live tree on commit, unless this build writes it
+    def remove(self, path):
+        if os.path.exists(path):
+            self.removals.add(path)
+
+    def staging_path(self, path):
+        return os.path.join(self.staging_dir, f"{next(self.staged_files)}-{os.path.basename(path)}")
+
+    def stage(self, path, staged_path, output_hash):
+        self.hashes[path] = output_hash
+        self.staged.pop(path, None)
+        try:
+            if file_hash(path) == output_hash:
+                os.remove(staged_path)
+                return False, output_hash
+        except FileNotFoundError:
+            pass
+        self.staged[path] = staged_path
+        return True, output_hash
+
+    # Function to move the changed files into the live tree and delete the stale ones. Returns whether
+    # anything in the live tree changed.
+    def commit(self):
+        is_page = lambda path: re.sub(r'\.(gz|br)$', '', path).endswith('.html')
+        for path in sorted(self.staged, key=is_page):
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            os.replace(self.staged[path], path)
+        removals = self.removals - self.hashes.keys()
+        for path in removals:
+            if os.path.exists(path):
+                os.remove(path)
+        changed = bool(self.staged or removals)
+        self.staged = {}
+        return changed
+
+    def discard(self):
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+# Function to check whether the outputs on disk still match what the cache says was generated from these inputs
+def is_up_to_date(cache, inputs):
+    if cache['inputs'] != inputs or not cache.get('outputs'):
+        return False
+    try:
+        return all(file_hash(path) == output_hash for path, output_hash in cache['outputs'].items())
+    except FileNotFoundError:
+        return False
+
+# Function to split BibTeX text at every match of `separator` that is not inside braces
+def split_outside_braces(text, separator):
+    depths = []
+    depth = 0
+    for c in text:
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth = max(depth - 1, 0)
+        depths.append(depth)
+    parts = []
+    start = 0
+    for match in separator.finditer(text):
+        if depths[match.start()] == 0:
+            parts.append(text[start:match.start()])
+            start = match.end()
+    parts.append(text[start:])
+    return parts
+
+# Function to get the key that identifies an author regardless of accents, case and punctuation,
+# so "Pavetić, Filip" and "Pavetic, Filip" end up as the same author
+def author_key(name):
+    letters = unicodedata.normalize('NFKD', name.replace('ı', 'i'))
+    letters = ''.join(c for c in letters if not unicodedata.combining(c)).casefold()
+    return ' '.join(re.sub(r'[^\w\s]', ' ', letters).split())
+
+# Function to convert a BibTeX name part to plain text, resolving LaTeX accents and dropping braces
+def latex_to_text(text):
+    text = lazy_import('bibtexparser.latexenc').latex_to_unicode(text).replace('{', '').replace('}', '')
+    # A dotless \i under an accent, as in {\'\i}, should read as a regular accented i
+    text = re.sub('ı(?=[\u0300-\u036f])', 'i', text)
+    return unicodedata.normalize('NFC', ' '.join(text.split()))
+
+# Function to parse one BibTeX author name ("Last, First", "Last, Jr, First" or "First Last").
+# Returns the "First Last" display name, its key and the key with initials for first names,
+# or None for "others". Memoized, since the same co-authors repeat across entries.
+@functools.lru_cache(maxsize=1 << 16)
+def parse_author_name(raw):
+    parts = [part.strip() for part in split_outside_braces(' '.join(raw.split()), NAME_PART_SEPARATOR)]
+    if len(parts) == 1 and parts[0].lower() == 'others':
+        return None
+    if len(parts) == 1:
+        words = split_outside_braces(parts[0], WHITESPACE)
+        first, last, jr = ' '.join(words[:-1]), words[-1], ''
+    elif len(parts) == 2:
+        last, first, jr = parts[0], parts[1], ''
+    else:
+        last, jr, first = parts[0], parts[1], ', '.join(parts[2:])
+    first, last, jr = latex_to_text(first), latex_to_text(last), latex_to_text(jr)
+    display_name = ' '.join(part for part in (first, last, jr) if part)
+    initials = ' '.join(word[0] for word in author_key(first).split())
+    initials_key = ' '.join(part for part in (initials, author_key(f"{last} {jr}")) if part)
+    return display_name, author_key(display_name), initials_key
+
+# Formats author lists and collects the deduplicated table of every author it has seen.
+# Highlighted authors (given as "First Last" or "Last, First") are compiled to sets of keys, which also
+# cover initials: "Alexander Kolesnikov" matches "A. Kolesnikov", and "A. Kolesnikov" matches any A. Kolesnikov.
+class AuthorIndex:
+    def __init__(self, highlighted=(DEFAULT_PROFILE['name'],)):
+        self.highlighted = set()
+        self.highlighted_initials = set()
+        for name in highlighted:
+            parsed = parse_author_name(name)
+            if parsed is None:
+                continue
+            _, key, initials_key = parsed
+            self.highlighted.update((key, initials_key))
+            if key == initials_key:
+                self.highlighted_initials.add(initials_key)
+        self.authors = {}
+
+    # Function to check whether a parsed author name is one of the highlighted authors
+    def is_highlighted(self, parsed):
+        _, key, initials_key = parsed
+        return key in self.highlighted or initials_key in self.highlighted_initials
+
+    # Function to count a parsed author name in the author table. Returns its row.
+    def add(self, parsed):
+        display_name, key, _ = parsed
+        author = self.authors.get(key)
+        if author is None:
+            author = self.authors[key] = {'name': display_name, 'key': key, 'variants': [], 'count': 0,
+                                          'highlighted': self.is_highlighted(parsed)}
+        if display_name not in author['variants']:
+            author['variants'].append(display_name)
+        author['count'] += 1
+        return author
+
+    # Function to format a BibTeX author field as HTML "First Last" names, bolding highlighted authors.
+    # Returns the HTML and the plain-text names of the authors.
+    def format(self, author_field):
+        formatted_authors = []
+        names = []
+        for raw in split_outside_braces(author_field, AUTHOR_SEPARATOR):
+            parsed = parse_author_name(raw.strip())
+            if parsed is None:
+                formatted_authors.append('et al.')
+                continue
+            author = self.add(parsed)
+            display_name = parsed[0]
+            names.append(display_name)
+            formatted_author = html.escape(display_name, quote=False)
+            formatted_authors.append(f"<b>{formatted_author}</b>" if author['highlighted'] else formatted_author)
+        return ', '.join(formatted_authors), names
+
+    # Function to get the deduplicated authors, most frequent first
+    def table(self):
+        return sorted(self.authors.values(), key=lambda author: (-author['count'], author['key']))
+
+# Function to convert LaTeX in an entry's fields to Unicode. The author field is left alone, since
+# braces decide where it splits into names; AuthorIndex converts each name on its own. The fields as
+# written in the bib file (with @string macros expanded) are kept in 'raw_fields' for BibTeX export.
+def convert_entry_to_unicode(entry):
+    raw_fields = {name: value for name, value in entry.items() if name not in ('ID', 'ENTRYTYPE')}
+    author = entry.pop('author', None)
+    entry = lazy_import('bibtexparser.customization').convert_to_unicode(entry)
+    if author is not None:
+        entry['author'] = author
+    entry['raw_fields'] = raw_fields
+    return entry
+
+# Function to get the authors to bold on a profile's page: its "highlight" list, or else the profile's own name
+def highlighted_authors(profile):
+    return profile.get('highlight') or [profile['name']]
+
+# Function to split BibTeX lines into top-level records (@string, @article, ...) without reading the whole file
+def iter_bibtex_records(lines):
+    record = []
+    depth = 0
+    for line in lines:
+        if depth == 0 and line.lstrip().startswith('@') and record:
+            yield ''.join(record)
+            record = []
+        record.append(line)
+        depth = max(depth + line.count('{') - line.count('}'), 0)
+    if record:
+        yield ''.join(record)
+
+# Function to parse BibTeX lines one record at a time, yielding each entry as soon as it is parsed.
+# A single parser is reused so @string macros defined earlier in the file are expanded in later entries.
+def iter_bibtex_entries(lines):
+    parser = lazy_import('bibtexparser.bparser').BibTexParser()
+    parser.customization = convert_entry_to_unicode
+    parser.expect_multiple_parse = True
+    bib_database = parser.bib_database
+    for record in iter_bibtex_records(lines):
+        with PROFILER.stage('parse'):
+            parser.parse(record)
+        # Hand entries over and drop them from the parser, which would otherwise accumulate the whole file
+        entries = bib_database.entries
+        bib_database.entries = []
+        bib_database.comments.clear()
+        yield from entries
+
+# A publication as the templates and outputs use it, normalized once from a parsed BibTeX entry. Text fields
+# are plain Unicode without BibTeX braces; `author` is the formatted HTML and `bibtex` is the entry, with
+# its fields as written in the bib file, serialized for citations and publications.bib. `key` hashes the
+# raw entry, the highlighted authors and the generator, and `image` is filled in by each build.
+class Publication:
+    __slots__ = ('key', 'ID', 'entry_type', 'title', 'author', 'author_names', 'year', 'journal', 'booktitle', 'venue',
+                 'arxiv', 'pdf', 'code', 'preview', 'selected', 'bibtex', 'image')
+    # Slots kept in the normalization cache
+    CACHED = __slots__[:-1]
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def to_cache(self):
+        return {name: getattr(self, name) for name in self.CACHED}
+
+# Function to strip BibTeX braces and collapse whitespace in a field value
+def plain_text(value):
+    return ' '.join(value.replace('{', '').replace('}', '').split())
+
+# Function to find the arXiv ids an entry mentions, mapped to the fields they appear in
+def arxiv_ids(entry):
+    ids = {}
+    for field in ('arxiv', 'eprint'):
+        if entry.get(field):
+            ids.setdefault(ARXIV_VERSION.sub('', entry[field].strip()), []).append(field)
+    for field in ('journal', 'pdf', 'url', 'note'):
+        for match in ARXIV_REFERENCE.finditer(entry.get(field, '')):
+            ids.setdefault(ARXIV_VERSION.sub('', match.group(1)), []).append(field)
+    return ids
+
+# Turns parsed entries into Publication records in one linear pass. Entries with an ID seen before are dropped,
+# and likely duplicates, inconsistent or malformed arXiv ids and missing fields are reported in `warnings`.
+# Records are cached with their warnings by the hash of the raw entry and of the generator, so unchanged entries
+# skip author formatting, text clean-up and validation until gen.py itself changes, and still report their warnings.
+class Normalizer:
+    def __init__(self, authors, cache=None):
+        self.authors = authors
+        self.cached = cache.get('records', {}) if cache is not None else {}
+        # Records for the next build's cache; without a cache none are kept, so memory stays bounded
+        self.keep_records = cache is not None
+        self.records = {}
+        self.settings_key = json.dumps([generator_hash(), sorted(authors.highlighted), sorted(authors.highlighted_initials)])
+        self.ids = set()
+        self.titles = {}
+        self.warnings = []
+
+    # Function to normalize a stream of parsed entries, yielding Publication records
+    def normalize(self, entries):
+        for entry in entries:
+            with PROFILER.stage('normalize'):
+                record = self.normalize_entry(entry)
+            if record is not None:
+                yield record
+
+    def normalize_entry(self, entry):
+        entry_id = entry['ID']
+        if entry_id in self.ids:
+            self.warnings.append(f"Duplicate ID '{entry_id}': keeping the first entry.")
+            return None
+        self.ids.add(entry_id)
+
+        key = content_hash(self.settings_key, json.dumps(entry, sort_keys=True))
+        cached = self.cached.get(key)
+        if cached is not None:
+            record, warnings = Publication(**cached['record']), cached['warnings']
+        else:
+            record = self.create(entry, key)
+            warnings = self.validate(entry, record)
+        if self.keep_records:
+            self.records[key] = {'record': record.to_cache(), 'warnings': warnings}
+        self.warnings += warnings
+
+        title_key = (author_key(record.title), record.year)
+        if record.title and title_key in self.titles:
+            self.warnings.append(f"'{entry_id}' has the same title and year as '{self.titles[title_key]}'.")
+        self.titles.setdefault(title_key, entry_id)
+        return record
+
+    def create(self, entry, key):
+        author, author_names = self.authors.format(entry['author']) if 'author' in entry else ('', [])
+        journal = plain_text(entry.get('journal', ''))
+        booktitle = plain_text(entry.get('booktitle', ''))
+        return Publication(
+            key=key,
+            ID=entry['ID'],
+            entry_type=entry.get('ENTRYTYPE', 'article').lower(),
+            title=plain_text(entry.get('title', '')),
+            author=author,
+            author_names=author_names,
+            year=plain_text(entry.get('year', '')),
+            journal=journal,
+            booktitle=booktitle,
+            venue=journal or booktitle,
+            arxiv=entry.get('arxiv', '').strip(),
+            pdf=entry.get('pdf', '').strip(),
+            code=entry.get('code', '').strip(),
+            preview=entry.get('preview', '').strip(),
+            selected=entry.get('selected', '').strip().lower() == 'true',
+            bibtex=serialize_bibtex(entry.get('ENTRYTYPE', 'article').lower(), entry['ID'], entry['raw_fields']),
+        )
+
+    # Function to get the warnings about a single entry
+    def validate(self, entry, record):
+        warnings = [f"'{record.ID}' has no {field}." for field in ('title', 'author', 'year') if not getattr(record, field)]
+        ids = arxiv_ids(entry)
+        if len(ids) > 1:
+            found = ', '.join(f"{arxiv_id} ({', '.join(fields)})" for arxiv_id, fields in sorted(ids.items()))
+            warnings.append(f"'{record.ID}' has inconsistent arXiv ids: {found}.")
+        if record.arxiv and not ARXIV_ID.fullmatch(record.arxiv):
+            warnings.append(f"'{record.ID}' has a malformed arXiv id '{record.arxiv}'.")
+        return warnings
+
+# Function to escape a field value for BibTeX. Braces are kept when they balance and escaped otherwise, and
+# unescaped &, % and # are escaped except in URL-like fields, where they are part of the address.
+def escape_bibtex(name, value):
+    value = ' '.join(value.split())
+    depth = 0
+    for c in value:
+        depth += {'{': 1, '}': -1}.get(c, 0)
+        if depth < 0:
+            break
+    if depth != 0:
+        value = re.sub(r'(?<!\\)([{}])', r'\\\1', value)
+    if name not in BIBTEX_VERBATIM_FIELDS:
+        value = re.sub(r'(?<!\\)([&%#])', r'\\\1', value)
+    return value
+
+# Function to serialize an entry as BibTeX, keeping its type and all fields except the ones that only
+# configure this site. Fields follow BIBTEX_FIELD_ORDER, then the rest alphabetically, so the output does
+# not depend on how the parser ordered them.
+def serialize_bibtex(entry_type, entry_id, fields):
+    order = lambda name: (BIBTEX_FIELD_ORDER.index(name) if name in BIBTEX_FIELD_ORDER else len(BIBTEX_FIELD_ORDER), name)
+    lines = [f"  {name} = {{{escape_bibtex(name, fields[name])}}}" for name in sorted(fields, key=order)
+             if name not in BIBTEX_SITE_FIELDS]
+    return f"@{entry_type}{{{entry_id},\n" + ',\n'.join(lines) + "\n}"
+
+# Function to get the URL of a publication preview image
+def preview_url(preview):
+    return f"/{PREVIEW_DIR}/{preview}"
+
+# Resizes publication previews into AVIF (when Pillow supports it) and WebP at PREVIEW_WIDTHS, recording
+# their intrinsic size for width/height attributes. Animated previews (GIFs) become a looping muted video
+# when ffmpeg is available, or an animated WebP otherwise, plus a static poster frame. Derived files are
+# named after the source hash, so an unchanged image is never re-encoded; sources are only re-hashed when
+# their size or mtime changes. Each derived file appears complete or not at all, and files no preview uses
+# any more are deleted with the build's other stale outputs.
+class PreviewImages:
+    def __init__(self, site_dir, cache_dir=CACHE_DIR):
+        from PIL import Image, features
+        self.Image = Image
+        self.formats = [('avif', 'image/avif')] if features.check('avif') else []
+        self.formats.append(('webp', 'image/webp'))
+        self.site_dir = site_dir
+        self.cache_path = os.path.join(cache_dir, f"images-{content_hash(os.path.abspath(site_dir))[:16]}.json")
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.cache = {}
+        self.used = {}
+
+    # Function to get the <picture> data of a preview, resizing it if needed
+    def prepare(self, preview):
+        source = os.path.join(self.site_dir, PREVIEW_DIR, preview)
+        try:
+            stat = os.stat(source)
+        except FileNotFoundError:
+            print(f"Warning: preview image '{source}' not found.")
+            return {'src': preview_url(preview)}
+        key = f"{preview}:{stat.st_size}:{stat.st_mtime_ns}"
+        image = self.cache.get(key)
+        if image is None or not all(os.path.exists(os.path.join(self.site_dir, path)) for path in image['files']):
+            try:
+                image = self.resize(source, preview)
+            # Pillow raises SyntaxError for some corrupt PNGs and OSError for unreadable or truncated files
+            except (OSError, SyntaxError) as e:
+                print(f"Warning: preview image '{source}' could not be converted ({e}); serving it unchanged.")
+                return {'src': preview_url(preview)}
+        self.used[key] = image
+        return image['html']
+
+    # Function to write the resized variants of one preview
+    def resize(self, source, preview):
+        digest = file_hash(source)[:12]
+        stem = os.path.splitext(preview)[0]
+        os.makedirs(os.path.join(self.site_dir, RESIZED_PREVIEW_DIR), exist_ok=True)
+        with self.Image.open(source) as img:
+            width, height = img.size
+            # Never upscale: widths beyond the source collapse into the source width
+            widths = [w for w in PREVIEW_WIDTHS if w < width]
+            if len(widths) < len(PREVIEW_WIDTHS):
+                widths.append(width)
+            if getattr(img, 'is_animated', False):
+                return self.animate(img, source, f"{RESIZED_PREVIEW_DIR}/{stem}-{digest}-{widths[-1]}", preview)
+            has_alpha = img.mode in ('RGBA', 'LA', 'P') or 'transparency' in img.info
+            frame = img.convert('RGBA' if has_alpha else 'RGB')
+
+        files = []
+        sources = []
+        for extension, mime_type in self.formats:
+            srcset = []
+            for target_width in widths:
+                path = f"{RESIZED_PREVIEW_DIR}/{stem}-{digest}-{target_width}.{extension}"
+                if not os.path.exists(os.path.join(self.site_dir, path)):
+                    resized = frame.resize((target_width, max(1, round(height * target_width / width))), self.Image.LANCZOS)
+                    with self.writing(path) as temporary_path:
+                        resized.save(temporary_path, quality=60 if extension == 'avif' else 80)
+                files.append(path)
+                srcset.append(f"/{path} {target_width}w")
+            sources.append({'type': mime_type, 'srcset': ', '.join(srcset)})
+        return {'files': files, 'html': {'src': preview_url(preview), 'width': width, 'height': height, 'sources': sources}}
+
+    # Function to convert an animated preview into a poster frame and a video or animated WebP.
+    # Playback is started by previews.js once the element scrolls into view.
+    def animate(self, img, source, base_path, preview):
+        from PIL import ImageSequence
+        width, height = img.size
+        target_width = int(base_path.rsplit('-', 1)[1])
+        size = (target_width, max(1, round(height * target_width / width)))
+        poster_path = f"{base_path}.poster.webp"
+        html = {'src': preview_url(preview), 'width': width, 'height': height, 'poster': f"/{poster_path}"}
+        files = [poster_path]
+
+        if not os.path.exists(os.path.join(self.site_dir, poster_path)):
+            img.seek(0)
+            with self.writing(poster_path) as temporary_path:
+                img.convert('RGB').resize(size, self.Image.LANCZOS).save(temporary_path, quality=80)
+
+        if shutil.which('ffmpeg'):
+            video_path = f"{base_path}.mp4"
+            try:
+                if not os.path.exists(os.path.join(self.site_dir, video_path)):
+                    # H.264 needs even dimensions; the video has no audio track at all
+                    with self.writing(video_path) as temporary_path:
+                        subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-i', source, '-an', '-movflags', '+faststart',
+                                        '-pix_fmt', 'yuv420p', '-vf', f"scale={size[0] // 2 * 2}:-2", temporary_path],
+                                       check=True)
+                html['video'] = f"/{video_path}"
+                files.append(video_path)
+                return {'files': files, 'html': html}
+            except subprocess.CalledProcessError as e:
+                print(f"Warning: ffmpeg could not convert '{source}' (exit status {e.returncode}); using animated WebP instead.")
+
+        # Without a video, the animation is served as animated WebP, or as the original if that is smaller
+        animated_path = f"{base_path}.webp"
+        if not os.path.exists(os.path.join(self.site_dir, animated_path)):
+            frames = []
+            durations = []
+            for frame in ImageSequence.Iterator(img):
+                frames.append(frame.convert('RGBA').resize(size, self.Image.LANCZOS))
+                durations.append(frame.info.get('duration', 100))
+            with self.writing(animated_path) as temporary_path:
+                frames[0].save(temporary_path, save_all=True, append_images=frames[1:], duration=durations, loop=0,
+                               quality=75, minimize_size=True, allow_mixed=True)
+        # Small dithered GIFs can beat animated WebP; then the original is kept, still deferred behind the poster
+        if os.path.getsize(os.path.join(self.site_dir, animated_path)) < os.path.getsize(source):
+            html['animated'] = f"/{animated_path}"
+            files.append(animated_path)
+        else:
+            os.remove(os.path.join(self.site_dir, animated_path))
+            html['animated'] = preview_url(preview)
+        return {'files': files, 'html': html}
+
+    # Function to write a derived file under a temporary name that only replaces `path` once it is complete, so
+    # an interrupted build never leaves a truncated file that later builds would take as done. Yields the
+    # temporary path, which keeps the extension encoders pick the format by.
+    @contextlib.contextmanager
+    def writing(self, path):
+        path = os.path.join(self.site_dir, path)
+        stem, extension = os.path.splitext(path)
+        temporary_path = f"{stem}.partial{extension}"
+        try:
+            yield temporary_path
+            os.replace(temporary_path, path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temporary_path)
+
+    # Function to persist the image cache, dropping previews that are no longer used, and have `tree` delete
+    # the derived files no used preview needs, such as those of replaced source images
+    def save(self, tree):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.used, f)
+        os.replace(self.cache_path + '.tmp', self.cache_path)
+        resized_dir = os.path.join(self.site_dir, RESIZED_PREVIEW_DIR)
+        if not os.path.isdir(resized_dir):
+            return
+        used_files = {os.path.normpath(os.path.join(self.site_dir, path)) for image in self.used.values() for path in image['files']}
+        for name in os.listdir(resized_dir):
+            path = os.path.normpath(os.path.join(resized_dir, name))
+            if path not in used_files:
+                tree.remove(path)
+
+# Function to set up the preview image stage, falling back to plain <img> tags if Pillow is missing
+def preview_images(site_dir, options):
+    if not options['responsive_images']:
+        return None
+    try:
+        return PreviewImages(site_dir)
+    except ImportError:
+        print("Warning: Pillow is not installed; serving preview images unchanged.")
+        return None
+
+# Maps static asset URLs to content-hashed copies (name.<hash>.ext under HASHED_ASSET_DIR) for --publish, so
+# they can be served with immutable cache headers; the originals are kept. Without --publish URLs are returned unchanged. Resized
+# previews are skipped since their names already contain the hash of their source.
+class AssetUrls:
+    def __init__(self, site_dir, enabled, tree):
+        self.site_dir = site_dir
+        self.enabled = enabled
+        self.tree = tree
+        self.manifest = {}
+
+    # Function to get the URL to reference a site-relative asset URL by
+    def url(self, url):
+        if not self.enabled or not url.startswith('/') or url.startswith(f"/{RESIZED_PREVIEW_DIR}/"):
+            return url
+        if url not in self.manifest:
+            # Outputs of this build are hashed as staged, not as the previous build left them
+            source = self.tree.source(os.path.join(self.site_dir, url.lstrip('/')))
+            if not os.path.exists(source):
+                return url
+            stem, extension = os.path.splitext(url)
+            hashed_url = f"/{HASHED_ASSET_DIR}{stem}.{file_hash(source)[:10]}{extension}"
+            self.tree.copy(source, os.path.join(self.site_dir, hashed_url.lstrip('/')))
+            self.manifest[url] = hashed_url
+        return self.manifest[url]
+
+    # Function to map the URLs of a preview image
+    def image(self, image):
+        image = dict(image)
+        for key in ('src', 'animated'):
+            if key in image:
+                image[key] = self.url(image[key])
+        return image
+
+    # Function to write the asset manifest and delete hashed copies that the previous manifest listed but this
+    # build no longer uses
+    def save(self):
+        manifest_path = os.path.join(self.site_dir, ASSET_MANIFEST_PATH)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            previous = {}
+        current = set(self.manifest.values())
+        for hashed_url in set(previous.values()) - current:
+            path = os.path.join(self.site_dir, hashed_url.lstrip('/'))
+            for stale_path in (path, path + '.gz', path + '.br'):
+                self.tree.remove(stale_path)
+        if not self.enabled:
+            for stale_path in (manifest_path, manifest_path + '.gz', manifest_path + '.br'):
+                self.tree.remove(stale_path)
+            return
+        self.tree.write(manifest_path, [json.dumps(self.manifest, indent=2, sort_keys=True)])
+
+# Builds the inverted index behind the client-side search (--search). Documents are numbered in page order;
+# title, author and venue tokens map to sorted, delta-encoded lists of document numbers, as do the year,
+# venue and author facets. search.js prefix-matches query tokens against the sorted terms, skipping the
+# stopwords the index leaves out, which it lists too.
+class SearchIndex:
+    def __init__(self):
+        self.pages = []
+        self.page_numbers = {}
+        self.docs = []
+        self.terms = {}
+        self.years = {}
+        self.venues = {}
+        self.authors = {}
+
+    # Function to add an entry rendered on `page` ('' for index.html)
+    def add(self, entry, page):
+        page = page or '/'
+        if page not in self.page_numbers:
+            self.page_numbers[page] = len(self.pages)
+            self.pages.append(page)
+        doc = len(self.docs)
+        self.docs.append([entry.ID, self.page_numbers[page], entry.title])
+        for name in entry.author_names:
+            self.authors.setdefault(author_key(name), [name, []])[1].append(doc)
+        if entry.venue:
+            self.venues.setdefault(entry.venue, []).append(doc)
+        if entry.year:
+            self.years.setdefault(entry.year, []).append(doc)
+        tokens = ' '.join([entry.title, entry.venue, *entry.author_names])
+        for token in set(author_key(tokens).split()) - SEARCH_STOPWORDS:
+            self.terms.setdefault(token, []).append(doc)
+
+    # Function to serialize the index as compact JSON
+    def dumps(self):
+        delta = lambda docs: [doc - previous for doc, previous in zip(docs, [0] + docs)]
+        facet = lambda postings: [[label, delta(docs)] for label, docs in postings]
+        index = {
+            'pages': self.pages,
+            'docs': self.docs,
+            'terms': {term: delta(self.terms[term]) for term in sorted(self.terms)},
+            'years': facet(sorted(self.years.items(), reverse=True)),
+            'venues': facet(sorted(self.venues.items(), key=lambda item: (-len(item[1]), item[0]))),
+            'authors': facet(sorted(self.authors.values(), key=lambda item: (-len(item[1]), item[0]))),
+            'stopwords': sorted(SEARCH_STOPWORDS),
+        }
+        return json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+
+# Function to describe an entry as schema.org ScholarlyArticle JSON-LD, safe to embed in a <script> element.
+# `url` is the entry's anchor and `site_url` the absolute site URL (or '' to keep site-relative URLs).
+def structured_data(entry, url, site_url):
+    article = {'@context': 'https://schema.org', '@type': 'ScholarlyArticle', '@id': url, 'url': url,
+               'headline': entry.title, 'name': entry.title}
+    if entry.author_names:
+        article['author'] = [{'@type': 'Person', 'name': name} for name in entry.author_names]
+    if entry.year:
+        article['datePublished'] = entry.year
+    if entry.journal:
+        article['isPartOf'] = {'@type': 'Periodical', 'name': entry.journal}
+    elif entry.booktitle:
+        article['isPartOf'] = {'@type': 'Book', 'name': entry.booktitle}
+    same_as = [f"https://arxiv.org/abs/{entry.arxiv}"] if entry.arxiv else []
+    if entry.pdf:
+        same_as.append(entry.pdf)
+    if same_as:
+        article['sameAs'] = same_as
+    if entry.image:
+        article['image'] = site_url + entry.image['src'] if entry.image['src'].startswith('/') else entry.image['src']
+    # "</" would end the script element early
+    return json.dumps(article, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+# Keeps the FEED_SIZE latest publications by year for the Atom feed, in a bounded heap fed during the single
+# pass over the entries. Within a year, entries earlier in the bib file count as newer.
+class Feed:
+    def __init__(self, size=FEED_SIZE):
+        self.size = size
+        self.heap = []
+
+    # Function to offer an entry at `position` with the absolute URL of its anchor
+    def add(self, entry, position, url):
+        year = ''.join(c for c in entry.year if c.isdigit())[:4]
+        if not year:
+            return
+        item = (int(year), -position, {'title': entry.title, 'url': url, 'authors': entry.author_names,
+                                       'venue': entry.venue, 'updated': f"{year}-01-01T00:00:00Z"})
+        if len(self.heap) < self.size:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+
+    # Function to get the kept entries, newest first
+    def entries(self):
+        return [item[2] for item in sorted(self.heap, key=lambda item: item[:2], reverse=True)]
+
+# Builds the precache manifest of the service worker (--service-worker): site-relative URLs with a revision
+# that changes only when the file's content does, so an updated worker downloads just the changed files.
+# Outputs of this build take the hash they were staged with; other files, such as preview images, are hashed
+# once and then reused from the build cache while their size and modification time are unchanged.
+class Precache:
+    def __init__(self, site_dir, tree, cache):
+        self.site_dir = site_dir
+        self.tree = tree
+        self.cached = cache.get('revisions', {})
+        self.revisions = cache['revisions'] = {}
+        self.images = {}
+
+    # Function to add every file a preview image may load
+    def add_image(self, image):
+        urls = [image[key] for key in ('src', 'poster', 'video', 'animated') if key in image]
+        for source in image.get('sources', []):
+            urls += [candidate.split()[0] for candidate in source['srcset'].split(',')]
+        for url in urls:
+            self.images.setdefault(url, None)
+
+    # Function to get the revision of the file behind a site-relative URL, or None if it does not exist
+    def revision(self, url, path=None):
+        path = path or os.path.join(self.site_dir, url.split('?', 1)[0].lstrip('/'))
+        if path in self.tree.hashes:
+            return self.tree.hashes[path][:16]
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        signature = [stat.st_size, stat.st_mtime_ns]
+        cached = self.cached.get(path)
+        if cached and cached[:2] == signature:
+            self.revisions[path] = cached
+        else:
+            self.revisions[path] = signature + [file_hash(path)[:16]]
+        return self.revisions[path][2]
+
+    # Function to stage the manifest and the service worker. `urls` are precached when the worker installs and
+    # preview images are cached as pages show them; `paths` maps URLs that do not follow the site layout to files.
+    def save(self, urls, paths):
+        manifest = {'precache': [], 'images': []}
+        for group, group_urls in (('precache', dict.fromkeys(urls)), ('images', self.images)):
+            for url in group_urls:
+                if not url.startswith('/'):
+                    continue
+                revision = self.revision(url, paths.get(url))
+                if revision is not None:
+                    manifest[group].append({'url': url, 'revision': revision})
+        manifest_json = json.dumps(manifest, separators=(',', ':'))
+        self.tree.write(os.path.join(self.site_dir, PRECACHE_MANIFEST_PATH), [manifest_json])
+        self.tree.write(os.path.join(self.site_dir, SERVICE_WORKER_PATH), load_template('sw.js').generate(
+            manifest_url=f"/{PRECACHE_MANIFEST_PATH}", manifest_version=content_hash(manifest_json)[:16]))
+
+# Function to check whether a service worker script exists and was written by gen.py
+def is_generated_service_worker(path):
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read(len(SERVICE_WORKER_HEADER)) == SERVICE_WORKER_HEADER
+    except FileNotFoundError:
+        return False
 
-            @media (max-width: 768px) {
-                body {
-                    padding: 1.5rem;
-                }
-
-                .header {
-                    flex-direction: column;
-                    text-align: center;
-                    padding: 2rem;
-                }
-
-                .profile-img {
-                    margin: 2rem 0 0 0;
-                }
-
-                .entry {
-                    flex-direction: column;
-                    gap: 1.5rem;
-                }
-
-                .preview img {
-                    max-width: 100%;
-                }
-
-                .links {
-                    justify-content: center;
-                }
-
-                .name {
-                    font-size: 2rem;
-                }
-            }
+# Function to stage .gz and .br siblings of a text output at maximum compression
+def precompress(tree, path):
+    data = tree.read(path)
+    # mtime=0 keeps the gzip output byte-identical across builds
+    tree.write_bytes(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        return
+    tree.write_bytes(path + '.br', brotli.compress(data, quality=11))
+
+# Function to pick the shard page of the entry at `position`, or None if it stays in index.html
+def shard_for(entry, position, options):
+    page_size = options['page_size']
+    if page_size is None or position < page_size:
+        return None
+    if options['shard_by'] == 'year':
+        year = ''.join(c for c in entry.year if c.isdigit())
+        key = year or 'undated'
+        label = year or 'Undated'
+    else:
+        number = (position - page_size) // page_size + 2
+        key = f"page-{number}"
+        label = f"Page {number}"
+    return {'key': key, 'label': label, 'url': f"/{SHARD_DIR}/{key}.html"}
+
+# Function to create an HTML page from the parsed BibTeX data and save it.
+# `entries` may be a list or a generator: entry fragments are spooled to temporary files as they are
+# rendered and pages are streamed to disk, so only the selected entries are kept in memory.
+# With options['page_size'], index.html keeps the first entries and the rest go to shard pages under
+# SHARD_DIR; publications/anchors.json maps every entry ID to its page so #pub_<ID> links still resolve.
+# With options['lazy_citations'], citations are streamed to citations.json instead of the pages.
+# With options['search'], search.json holds an inverted index of every entry for the search box.
+# Every entry carries schema.org JSON-LD, and when the site's public URL is known (profile "url" or CNAME),
+# sitemap.xml lists the pages and feed.xml is an Atom feed of the latest publications; all of them come from
+# the same pass over the entries.
+# With options['service_worker'], sw.js precaches the files listed in precache-manifest.json for offline use.
+# With a build cache, files the previous build wrote and this one does not are deleted, and with
+# options['incremental'] entry fragments and the About Me HTML are reused when their inputs are unchanged.
+def create_html(entries, output_path="index.html", cache=None, about_markdown=ABOUT_MARKDOWN, profile=DEFAULT_PROFILE,
+                options=DEFAULT_OPTIONS):
+    # Rendered fragments are only collected for a cache that outlives this build
+    keep_fragments = cache is not None and options['incremental']
+    if cache is None:
+        cache = {**empty_build_cache(), **empty_build_data()}
+    site_dir = os.path.dirname(output_path) or '.'
 
-            @media (prefers-color-scheme: dark) {
-                :root {
-                    --bg-primary: #1a1a1a;
-                    --bg-secondary: #111111;
-                    --text-primary: #ffffff;
-                    --text-secondary: #a0a0a0;
-                }
-
-                .links a {
-                    background: rgba(37, 99, 235, 0.2);
-                }
-
-                .links a:hover {
-                    background: rgba(37, 99, 235, 0.3);
-                }
-
-                .citation-text {
-                    background: rgba(255, 255, 255, 0.05);
-                }
-            }
-        </style>
-        <script>
-            function toggleCitation(id) {
-                const citationElement = document.getElementById(id);
-                const allCitations = document.querySelectorAll('.citation-text');
-                
-                allCitations.forEach(citation => {
-                    if (citation.id !== id) {
-                        citation.style.display = "none";
-                    }
-                });
-
-                if (citationElement.style.display === "none" || citationElement.style.display === "") {
-                    citationElement.style.display = "block";
-                } else {
-                    citationElement.style.display = "none";
-                }
+    # Convert the About Me section from Markdown to HTML
+    about_hash = content_hash(about_markdown)
+    if cache['about_hash'] != about_hash:
+        cache['about_hash'] = about_hash
+        with PROFILER.stage('markdown'):
+            cache['about_html'] = lazy_import('markdown').markdown(about_markdown)
+    about_html = cache['about_html']
+
+    # Render each entry, reusing cached fragments for entries whose fields did not change
+    templates_key = content_hash(template_hash(), generator_hash())
+    entry_template = None
+    fragments = {}
+    selected_entries = []
+    has_animated_previews = False
+    images = preview_images(site_dir, options)
+    tree = OutputTree(site_dir)
+    assets = AssetUrls(site_dir, options['publish'], tree)
+    search = SearchIndex() if options['search'] else None
+    site_url = public_site_url(site_dir, profile)
+    feed = Feed() if site_url else None
+    precache = Precache(site_dir, tree, cache) if options['service_worker'] else None
+    index_spool = tempfile.SpooledTemporaryFile(max_size=1 << 22, mode='w+', encoding='utf-8')
+    citations_spool = tempfile.SpooledTemporaryFile(max_size=1 << 22, mode='w+', encoding='utf-8')
+    bibtex_spool = tempfile.SpooledTemporaryFile(max_size=1 << 22, mode='w+', encoding='utf-8')
+    shards = {}
+    anchors = {}
+    try:
+        for position, entry in enumerate(entries):
+            with PROFILER.stage('entries'):
+                shard = shard_for(entry, position, options)
+                if shard is None:
+                    page, spool = '', index_spool
+                else:
+                    if shard['key'] not in shards:
+                        shards[shard['key']] = {**shard, 'spool': tempfile.SpooledTemporaryFile(max_size=1 << 20, mode='w+', encoding='utf-8')}
+                    page, spool = shard['url'], shards[shard['key']]['spool']
+                anchors[entry.ID] = page or '/'
+                if search:
+                    search.add(entry, page)
+
+                if entry.preview:
+                    with PROFILER.stage('images'):
+                        entry.image = assets.image(images.prepare(entry.preview) if images else {'src': preview_url(entry.preview)})
+                    has_animated_previews = has_animated_previews or 'poster' in entry.image
+                    if precache is not None:
+                        precache.add_image(entry.image)
+                # Separate selected entries
+                if entry.selected:
+                    selected_entries.append({'ID': entry.ID, 'title': entry.title, 'image': entry.image, 'page': page})
+                bibtex_spool.write(f"\n{entry.bibtex}\n" if position else f"{entry.bibtex}\n")
+                if options['lazy_citations']:
+                    citations_spool.write(f"{',' if position else ''}{json.dumps(entry.ID)}:{json.dumps(entry.bibtex)}")
+                entry_url = f"{site_url or ''}{page or '/'}#pub_{entry.ID}"
+                if feed:
+                    feed.add(entry, position, entry_url)
+                key = content_hash(templates_key, entry.key, json.dumps(entry.image, sort_keys=True), str(options['lazy_citations']), entry_url)
+                fragment = cache['fragments'].get(key)
+                if fragment is None:
+                    if entry_template is None:
+                        entry_template = load_template('partials/entry.html')
+                    fragment = entry_template.render(entry=entry, inline_citation=not options['lazy_citations'],
+                                                     structured_data=structured_data(entry, entry_url, site_url or ''))
+                if keep_fragments:
+                    fragments[key] = fragment
+                spool.write(fragment)
+        # Only keep fragments of entries that still exist
+        if keep_fragments:
+            cache['fragments'] = fragments
+        if images:
+            images.save(tree)
+
+        # Stage the files the pages reference first, so the pages can link their content-hashed copies
+        if options['optimize']:
+            # The deferred stylesheet is everything that is not critical for the first paint
+            site_css = minify_css(get_environment().loader.get_source(get_environment(), 'site.css')[0])
+            tree.write(os.path.join(site_dir, SITE_CSS_PATH), [site_css])
+        bibtex_spool.seek(0)
+        tree.write(os.path.join(site_dir, PUBLICATIONS_BIB_PATH), iter(lambda: bibtex_spool.read(1 << 16), ''))
+        if options['lazy_citations']:
+            citations_spool.seek(0)
+            chunks = itertools.chain('{', iter(lambda: citations_spool.read(1 << 16), ''), '}')
+            tree.write(os.path.join(site_dir, 'citations.json'), chunks)
+        if search:
+            tree.write(os.path.join(site_dir, 'search.json'), [search.dumps()])
+        if shards:
+            tree.write(os.path.join(site_dir, SHARD_DIR, 'anchors.json'), [json.dumps(anchors, separators=(',', ':'))])
+        if site_url:
+            page_urls = ['/'] + [shard['url'] for shard in shards.values()]
+            tree.write(os.path.join(site_dir, SITEMAP_PATH),
+                       load_template('sitemap.xml').generate(site_url=site_url, page_urls=page_urls))
+            feed_entries = feed.entries()
+            tree.write(os.path.join(site_dir, FEED_PATH), load_template('feed.xml').generate(
+                site_url=site_url, profile=profile, feed_entries=feed_entries, feed_path=FEED_PATH,
+                updated=feed_entries[0]['updated'] if feed_entries else '1970-01-01T00:00:00Z'))
+
+        # Using Jinja2 to populate the HTML templates with entries
+        shard_list = [{key: shard[key] for key in ('key', 'label', 'url')} for shard in shards.values()]
+        context = {
+            'about_html': about_html,
+            'profile': {**profile, 'image': assets.url(profile['image'])},
+            'has_animated_previews': has_animated_previews,
+            'shards': shard_list,
+            'optimize': options['optimize'],
+            'site_css_url': assets.url(f"/{SITE_CSS_PATH}") if options['optimize'] else None,
+            'citations_url': assets.url('/citations.json') if options['lazy_citations'] else '/citations.json',
+            'anchors_url': assets.url(f"/{SHARD_DIR}/anchors.json") if shards else None,
+            'search': options['search'],
+            'search_url': assets.url('/search.json') if search else None,
+            'bibtex_url': assets.url(f"/{PUBLICATIONS_BIB_PATH}"),
+            'feed_url': f"/{FEED_PATH}" if site_url else None,
+            'service_worker_url': f"/{SERVICE_WORKER_PATH}" if precache is not None else None,
+            'current_date': datetime.now().strftime("%B %d, %Y"),
+            'current_year': datetime.now().year,
+        }
+        pages = [(output_path, 'layout.html', index_spool, {'selected_entries': selected_entries, 'current_url': '/'})]
+        for shard in shards.values():
+            pages.append((os.path.join(site_dir, SHARD_DIR, f"{shard['key']}.html"), 'shard.html', shard['spool'],
+                          {'shard': shard, 'current_url': shard['url']}))
+
+        # Stage the rendered pages; pages that did not change are left untouched on commit
+        for path, template_name, spool, page_context in pages:
+            spool.seek(0)
+            rendered_html = load_template(template_name).generate(
+                entries_html=iter(lambda: spool.read(1 << 16), ''), **context, **page_context)
+            if options['optimize']:
+                rendered_html = minify_html(rendered_html)
+            with PROFILER.stage('pages'):
+                tree.write(path, rendered_html)
+
+        # The precache manifest lists the outputs just staged, so it comes after every file it names
+        if precache is not None:
+            urls = ['/'] + [shard['url'] for shard in shard_list]
+            urls += [context[name] for name in ('site_css_url', 'anchors_url', 'search_url') if context[name]]
+            if options['lazy_citations']:
+                urls.append(context['citations_url'])
+            urls.append(context['profile']['image'])
+            precache.save(urls, {'/': output_path})
+        elif is_generated_service_worker(os.path.join(site_dir, SERVICE_WORKER_PATH)):
+            # Browsers keep running a worker whose script is gone, so replace it with one that removes itself
+            tree.write(os.path.join(site_dir, SERVICE_WORKER_PATH), load_template('sw.js').generate(manifest_version=None))
+
+        # Record hashed asset copies, then precompress every text output
+        with PROFILER.stage('assets'):
+            assets.save()
+            if options['publish']:
+                for path in [path for path in tree.hashes if path.endswith(COMPRESSIBLE_EXTENSIONS)]:
+                    precompress(tree, path)
+            else:
+                # Precompressed siblings left by an earlier --publish build would now be served stale
+                for path in list(tree.hashes):
+                    tree.remove(path + '.gz')
+                    tree.remove(path + '.br')
+        remove_stale_shards(site_dir, tree, cache['outputs'])
+        # Data files of features this build does not use would otherwise linger with stale content. Only files the
+        # previous build wrote go, so a hand-maintained sitemap.xml or feed.xml on a site without a public URL stays.
+        previous_outputs = {os.path.abspath(path) for path in cache['outputs']}
+        for name in (SITE_CSS_PATH, 'citations.json', 'search.json', SITEMAP_PATH, FEED_PATH, PRECACHE_MANIFEST_PATH):
+            path = os.path.join(site_dir, name)
+            for stale_path in (path, path + '.gz', path + '.br'):
+                if os.path.abspath(stale_path) in previous_outputs:
+                    tree.remove(stale_path)
+
+        # Publish the whole output tree at once
+        with PROFILER.stage('write'):
+            written = tree.commit()
+        cache['outputs'] = tree.hashes
+    finally:
+        tree.discard()
+        index_spool.close()
+        citations_spool.close()
+        bibtex_spool.close()
+        for shard in shards.values():
+            shard['spool'].close()
+    return written
+
+# Function to delete the shard pages and anchor maps, with their precompressed siblings, that the previous build
+# wrote (by `previous_outputs`, the output hashes in the build cache) and this one does not. Anything else in the
+# shard directory, such as PDFs kept next to the pages, is left alone.
+def remove_stale_shards(site_dir, tree, previous_outputs):
+    shard_dir = os.path.abspath(os.path.join(site_dir, SHARD_DIR))
+    for path in previous_outputs:
+        name = re.sub(r'\.(gz|br)$', '', os.path.basename(path))
+        if os.path.dirname(os.path.abspath(path)) == shard_dir and re.fullmatch(r'.+\.html|anchors.*\.json', name):
+            tree.remove(path)
+
+# Function to escape text for Markdown
+def escape_markdown(text):
+    return re.sub(r'([\\`*_{}\[\]<>#|])', r'\\\1', text)
+
+# Function to make a URL safe as a Markdown link target
+def escape_markdown_url(url):
+    return url.replace(' ', '%20').replace('(', '%28').replace(')', '%29')
+
+# Function to escape text for LaTeX
+def escape_latex(text):
+    return ''.join(LATEX_SPECIAL_CHARACTERS.get(c, c) for c in text)
+
+# Function to escape a URL for \href, where only % and # still need escaping
+def escape_latex_url(url):
+    return url.replace('%', r'\%').replace('#', r'\#')
+
+# Renders parsed publications into one output format (--formats). A renderer picks the build inputs its
+# outputs depend on, so incremental builds skip it while they are unchanged.
+class Renderer:
+    name = None
+
+    def __init__(self, output_path, cache, about_markdown, profile, options):
+        self.output_path = output_path
+        self.cache = cache
+        self.about_markdown = about_markdown
+        self.profile = profile
+        self.options = options
+
+    # Function to pick the build inputs this renderer's outputs depend on
+    def inputs(self, build_inputs):
+        return build_inputs
+
+    def is_up_to_date(self, inputs):
+        raise NotImplementedError
+
+    # Function to load what render() needs; called on the main thread, since imports are not thread-safe
+    def prepare(self):
+        pass
+
+    # Function to render a stream of Publication records. Returns whether any output changed.
+    def render(self, entries):
+        raise NotImplementedError
+
+    # Function to record the inputs of a successful render in the build cache
+    def finish(self, inputs):
+        raise NotImplementedError
+
+# Renders the HTML pages with create_html. Its state lives at the top level of the build cache.
+class HtmlRenderer(Renderer):
+    name = 'html'
+
+    def is_up_to_date(self, inputs):
+        return self.cache is not None and is_up_to_date(self.cache, inputs)
+
+    def render(self, entries):
+        return create_html(entries, self.output_path, self.cache, self.about_markdown, self.profile, self.options)
+
+    def finish(self, inputs):
+        if self.cache is not None:
+            self.cache['inputs'] = inputs
+
+# Renders every publication into a single file next to the page, written through an OutputTree and
+# precompressed with --publish. Its build cache state is kept per renderer under cache['renderers'].
+# Subclasses set `name` and `path` and stream the file's text from chunks().
+class FileRenderer(Renderer):
+    path = None
+
+    def __init__(self, output_path, cache, about_markdown, profile, options):
+        super().__init__(output_path, cache, about_markdown, profile, options)
+        self.site_dir = os.path.dirname(output_path) or '.'
+        self.state = {'inputs': {}, 'outputs': {}}
+        if cache is not None:
+            self.state = cache.setdefault('renderers', {}).setdefault(self.name, self.state)
+
+    # The About Me text and the page options do not affect these files
+    def inputs(self, build_inputs):
+        inputs = {name: build_inputs[name] for name in ('bib', 'profile', 'template', 'generator')}
+        return {**inputs, 'format': self.name, 'publish': self.options['publish']}
+
+    def is_up_to_date(self, inputs):
+        return self.cache is not None and is_up_to_date(self.state, inputs)
+
+    def prepare(self):
+        self.authors = AuthorIndex(highlighted_authors(self.profile))
+
+    def render(self, entries):
+        path = os.path.join(self.site_dir, self.path)
+        tree = OutputTree(self.site_dir)
+        try:
+            tree.write(path, self.chunks(entries))
+            if self.options['publish']:
+                precompress(tree, path)
+            # Files the previous render wrote and this one does not, such as .gz/.br siblings of a --publish build
+            for stale_path in self.state['outputs']:
+                tree.remove(stale_path)
+            written = tree.commit()
+            self.state['outputs'] = tree.hashes
+        finally:
+            tree.discard()
+        return written
+
+    def finish(self, inputs):
+        self.state['inputs'] = inputs
+
+    # Function to get an entry's authors as (name, highlighted) pairs, with "et al." for "others"
+    def author_list(self, entry):
+        authors = [(name, self.authors.is_highlighted(parse_author_name(name))) for name in entry.author_names]
+        if entry.author.endswith('et al.'):
+            authors.append(('et al.', False))
+        return authors
+
+    def chunks(self, entries):
+        raise NotImplementedError
+
+# Renders publications.json, a machine-readable list of the publications for other tools, followed by the
+# deduplicated table of their authors (name variants, number of publications, highlighted) as co-author list
+class JsonRenderer(FileRenderer):
+    name = 'json'
+    path = PUBLICATIONS_JSON_PATH
+
+    def chunks(self, entries):
+        yield f'{{"name":{json.dumps(self.profile["name"], ensure_ascii=False)},"publications":['
+        for position, entry in enumerate(entries):
+            for name in entry.author_names:
+                parsed = parse_author_name(name)
+                if parsed is not None:
+                    self.authors.add(parsed)
+            publication = {
+                'id': entry.ID,
+                'type': entry.entry_type,
+                'title': entry.title,
+                'authors': entry.author_names,
+                'highlighted': [name for name, highlighted in self.author_list(entry) if highlighted],
+                'year': entry.year or None,
+                'journal': entry.journal or None,
+                'booktitle': entry.booktitle or None,
+                'venue': entry.venue or None,
+                'arxiv': entry.arxiv or None,
+                'pdf': entry.pdf or None,
+                'code': entry.code or None,
+                'preview': preview_url(entry.preview) if entry.preview else None,
+                'selected': entry.selected,
+                'bibtex': entry.bibtex,
             }
-        </script>
-    </head>
-    <body>
-        <div class="header">
-            <div class="header-left">
-                <p class="name">Alexander Kolesnikov</p>
-                <p class="title">Member of Technical Staff at OpenAI</p>
-            </div>
-            <img src="/assets/img/profile.jpg" class="profile-img" alt="Profile Image"/>
-        </div>
-
-        <div class="about">
-            {{ about_html | safe }}
-        </div>
-
-        {% if selected_entries %}
-        <h1>Selected Publications</h1>
-        <div class="selected-publications-grid">
-        {% for entry in selected_entries %}
-            <div class="selected-publication-card">
-                {% if entry.preview %}
-                <a href="#pub_{{ entry.ID }}">
-                    <img src="/assets/img/publication_preview/{{ entry.preview }}" alt="Preview image">
-                </a>
-                {% endif %}
-                <p><a href="#pub_{{ entry.ID }}">{{ entry.title }}</a></p>
-            </div>
-        {% endfor %}
-        </div>
-        {% endif %}
-
-        <h1>Publications</h1>
-        {% for entry in entries %}
-        <div class="entry" id="pub_{{ entry.ID }}">
-            <div class="entry-content">
-                <div class="entry-title">{{ entry.title }}</div>
-                {% if entry.author %}
-                    <div class="author">Authors: {{ entry.author | safe }}</div>
-                {% endif %}
-                {% if entry.year %}
-                    <div class="year">Year: {{ entry.year }}</div>
-                {% endif %}
-                {% if entry.journal %}
-                    <div class="journal">Journal: {{ entry.journal }}</div>
-                {% endif %}
-                <div class="links">
-                    {% if entry.arxiv %}
-                        <a href="https://arxiv.org/abs/{{ entry.arxiv }}" target="_blank">arXiv</a>
-                    {% endif %}
-                    {% if entry.pdf %}
-                        <a href="{{ entry.pdf }}" target="_blank">PDF</a>
-                    {% endif %}
-                    {% if entry.code %}
-                        <a href="{{ entry.code }}" target="_blank">Code</a>
-                    {% endif %}
-                    <button class="cite-button" onclick="toggleCitation('citation_{{ loop.index }}')">Cite</button>
-                </div>
-                <div id="citation_{{ loop.index }}" class="citation-text">{{ entry.bibtex | replace('\\n', '<br>') | safe }}</div>
-            </div>
-            {% if entry.preview %}
-                <div class="preview">
-                    <img src="/assets/img/publication_preview/{{ entry.preview }}" alt="Preview image">
-                </div>
-            {% endif %}
-        </div>
-        {% endfor %}
-
-        <div class="footer">
-            <p>Last updated: {{ current_date }}</p>
-            <p>This website was generated with the assistance of Large Language Models.</p>
-            <p>© {{ current_year }} Alexander Kolesnikov.</p>
-        </div>
-    </body>
-    </html>
-    """
-
-    # Prepare BibTeX entries for each citation button
-    for entry in entries:
-        entry_type = entry.get('ENTRYTYPE', 'article')
-        entry_id = entry.get('ID', entry.get('id', ''))
-        title = entry.get('title', 'No Title').replace('{', '').replace('}', '')
-        # Use original_author here to keep BibTeX format
-        author = entry.get('original_author', 'No Author')
-        journal = entry.get('journal', 'No Journal').replace('{', '').replace('}', '')
-        year = entry.get('year', 'No Year').replace('{', '').replace('}', '')
-
-        # Construct the BibTeX entry string
-        entry['bibtex'] = f"@{entry_type}{{{entry_id},\n  title = {{{title}}},\n  author = {{{author}}},\n  journal = {{{journal}}},\n  year = {{{year}}}\n}}"
-
-    # Using Jinja2 to populate the HTML template with entries
-    template = Template(html_template)
-    rendered_html = template.render(
-        entries=entries, 
-        about_html=about_html, 
-        selected_entries=selected_entries,
-        current_date=datetime.now().strftime("%B %d, %Y"),
-        current_year=datetime.now().year
-    )
-
-    # Write the rendered HTML to a file
-    with open("index.html", "w", encoding="utf-8") as f:
-        f.write(rendered_html)
+            yield (',' if position else '') + json.dumps(publication, ensure_ascii=False, separators=(',', ':'))
+        authors = [{'name': author['name'], 'variants': author['variants'], 'publications': author['count'],
+                    'highlighted': author['highlighted']} for author in self.authors.table()]
+        yield f'],"authors":{json.dumps(authors, ensure_ascii=False, separators=(",", ":"))}}}\n'
+
+# Renders a file from a template that streams `entries`; `author_list` gives each entry's authors
+class TemplateRenderer(FileRenderer):
+    template_name = None
+
+    def prepare(self):
+        super().prepare()
+        self.template = load_template(self.template_name)
+
+    def chunks(self, entries):
+        return self.template.generate(entries=entries, profile=self.profile, author_list=self.author_list)
+
+# Renders publications.md, a Markdown list of the publications
+class MarkdownRenderer(TemplateRenderer):
+    name = 'markdown'
+    path = PUBLICATIONS_MARKDOWN_PATH
+    template_name = 'publications.md'
+
+# Renders publications.tex, a publications section to \input into a LaTeX CV
+class LatexRenderer(TemplateRenderer):
+    name = 'latex'
+    path = PUBLICATIONS_LATEX_PATH
+    template_name = 'publications.tex'
+
+# Renderers by --formats name
+RENDERERS = {renderer.name: renderer for renderer in (HtmlRenderer, JsonRenderer, MarkdownRenderer, LatexRenderer)}
+
+# Function to render one stream of records with several renderers at once. The first renderer consumes the
+# stream on this thread while the others run on worker threads, fed through bounded queues, so the bib file
+# is parsed once and memory stays bounded. Each renderer publishes its outputs on its own: if the stream
+# fails none of them do, while a failing renderer leaves the others be. The first error is raised once all
+# renderers are done. Returns whether any output changed.
+def render_concurrently(renderers, entries):
+    for renderer in renderers:
+        renderer.prepare()
+    if len(renderers) == 1:
+        return renderers[0].render(entries)
+
+    queue = lazy_import('queue')
+    end, failed = object(), object()
+    queues = [queue.Queue(maxsize=RENDER_QUEUE_SIZE) for _ in renderers[1:]]
+    results = [None] * len(renderers)
+
+    def work(index, entry_queue):
+        sentinels = []
+
+        def stream():
+            while True:
+                entry = entry_queue.get()
+                if entry is end or entry is failed:
+                    sentinels.append(entry)
+                    if entry is failed:
+                        raise RuntimeError("rendering stopped since another output failed")
+                    return
+                yield entry
+
+        try:
+            results[index] = renderers[index].render(stream())
+        except Exception as e:
+            results[index] = e
+        finally:
+            # A renderer that stopped before the end of the stream keeps taking records, so the main thread
+            # never blocks on this queue
+            if not sentinels:
+                while entry_queue.get() not in (end, failed):
+                    pass
+
+    def tee():
+        for entry in entries:
+            for entry_queue in queues:
+                entry_queue.put(entry)
+            yield entry
+
+    threads = [threading.Thread(target=work, args=(index, entry_queue))
+               for index, entry_queue in enumerate(queues, start=1)]
+    for thread in threads:
+        thread.start()
+    try:
+        results[0] = renderers[0].render(tee())
+    except Exception as e:
+        results[0] = e
+    for entry_queue in queues:
+        entry_queue.put(failed if isinstance(results[0], Exception) else end)
+    for thread in threads:
+        thread.join()
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        raise errors[0]
+    return any(results)
+
+# Function to delete the files that formats this build does not render wrote in earlier builds, as the build
+# cache records them, and forget their cached state. Files gen.py did not write are never touched. Returns
+# whether anything changed.
+def remove_unused_renderer_outputs(site_dir, formats, cache):
+    unused = [name for name in cache['renderers'] if name not in formats]
+    stale_paths = [path for name in unused for path in cache['renderers'][name]['outputs'] if os.path.exists(path)]
+    for name in unused:
+        del cache['renderers'][name]
+    if stale_paths:
+        tree = OutputTree(site_dir)
+        try:
+            for path in stale_paths:
+                tree.remove(path)
+            tree.commit()
+        finally:
+            tree.discard()
+    return bool(stale_paths or unused)
+
+# Function to build one page, and any other formats in options['formats'], from a bib file.
+# Returns "up to date", "generated" or "unchanged".
+def build_page(bib_path='bibtex.bib', output_path='index.html', about_markdown=ABOUT_MARKDOWN,
+               profile=DEFAULT_PROFILE, options=None):
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    # Every build records what it wrote, so later builds only ever delete their own outputs; only incremental
+    # builds skip work by it
+    cache = load_build_cache(output_path)
+    site_dir = os.path.dirname(output_path) or '.'
+    with PROFILER.stage('inputs'):
+        inputs = build_inputs(bib_path, about_markdown, profile, options, site_dir)
+    renderers = []
+    for name in options['formats']:
+        renderer = RENDERERS[name](output_path, cache, about_markdown, profile, options)
+        renderer_inputs = renderer.inputs(inputs)
+        if not (options['incremental'] and renderer.is_up_to_date(renderer_inputs)):
+            renderers.append((renderer, renderer_inputs))
+    removed = remove_unused_renderer_outputs(site_dir, options['formats'], cache)
+    if not renderers:
+        if removed:
+            save_build_cache(cache, output_path)
+        return "up to date"
+
+    # Stream BibTeX entries from the file through normalization into every renderer whose inputs changed
+    os.makedirs(site_dir, exist_ok=True)
+    if options['incremental']:
+        load_build_data(cache, output_path)
+    else:
+        cache.update(empty_build_data())
+    normalizer = Normalizer(AuthorIndex(highlighted_authors(profile)), cache if options['incremental'] else None)
+    with open(bib_path, 'r', encoding='utf-8') as f:
+        written = render_concurrently([renderer for renderer, _ in renderers], normalizer.normalize(iter_bibtex_entries(f)))
+    for warning in normalizer.warnings:
+        print(f"Warning: {bib_path}: {warning}")
+    # Only keep normalized records of entries that still exist
+    cache['records'] = normalizer.records
+    for renderer, renderer_inputs in renderers:
+        renderer.finish(renderer_inputs)
+    save_build_cache(cache, output_path, with_data=options['incremental'])
+    return "generated" if written else "unchanged"
+
+# Function to read a batch manifest: a JSON list of jobs, each with "bib" and "output" paths and an
+# optional "about" Markdown file and "profile" (an object or a JSON file overriding DEFAULT_PROFILE; its
+# optional "highlight" list names the authors to bold instead of the profile's own name).
+# Relative paths are resolved against the manifest's directory. Every job needs a directory of its own, since
+# the files next to a page (publications.bib, shards, feeds, data files) would otherwise overwrite each other.
+def read_manifest(manifest_path):
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    resolve = lambda path: os.path.join(base_dir, path)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        jobs = json.load(f)
+
+    resolved_jobs = []
+    for job in jobs:
+        about_markdown = ABOUT_MARKDOWN
+        if 'about' in job:
+            with open(resolve(job['about']), 'r', encoding='utf-8') as f:
+                about_markdown = f.read()
+        profile = job.get('profile', {})
+        if isinstance(profile, str):
+            with open(resolve(profile), 'r', encoding='utf-8') as f:
+                profile = json.load(f)
+        resolved_jobs.append({
+            'bib_path': resolve(job['bib']),
+            'output_path': resolve(job['output']),
+            'about_markdown': about_markdown,
+            'profile': {**DEFAULT_PROFILE, **profile},
+        })
+
+    site_dirs = {}
+    for job in resolved_jobs:
+        site_dir = os.path.dirname(os.path.normpath(job['output_path']))
+        if site_dir in site_dirs:
+            raise ValueError(f"{manifest_path}: '{job['output_path']}' and '{site_dirs[site_dir]}' share the output "
+                             f"directory '{site_dir}'; give every job a directory of its own.")
+        site_dirs[site_dir] = job['output_path']
+    return resolved_jobs
+
+# Function to load the compiled templates once per worker process
+def warm_templates():
+    environment = get_environment()
+    environment.get_template('layout.html')
+    environment.get_template('partials/entry.html')
+
+# Function to run a single batch job and time it
+def run_job(job, options):
+    start = time.perf_counter()
+    status = build_page(options=options, **job)
+    return status, time.perf_counter() - start
+
+# Function to build every page of a batch manifest across a pool of worker processes.
+# Templates are compiled once up front; forked workers inherit them and others load them from the bytecode cache.
+def run_batch(manifest_path, workers=None, options=None):
+    jobs = read_manifest(manifest_path)
+    warm_templates()
+    start = time.perf_counter()
+    failures = 0
+    futures_module = lazy_import('concurrent.futures')
+    with futures_module.ProcessPoolExecutor(max_workers=workers, initializer=warm_templates) as pool:
+        futures = {pool.submit(run_job, job, options): job for job in jobs}
+        for future in futures_module.as_completed(futures):
+            output_path = futures[future]['output_path']
+            try:
+                status, seconds = future.result()
+                print(f"{output_path}: {status} in {seconds * 1000:.1f} ms")
+            except Exception as e:
+                failures += 1
+                print(f"{output_path}: failed: {e}")
+    print(f"Built {len(jobs) - failures} of {len(jobs)} pages in {time.perf_counter() - start:.2f} s.")
+    return failures == 0
+
+# Fetches external links for --check with http.client, returning the final HTTP status after redirects.
+# Connections are pooled per host and reused, requests to the same host start at least `interval` seconds
+# apart and at most `concurrency` run at once. Any object with an async fetch(url) that returns a status or
+# raises OSError can stand in for it, e.g. to check against a stub server.
+class HttpFetcher:
+    def __init__(self, concurrency=LINK_CONCURRENCY, interval=LINK_INTERVAL, timeout=LINK_TIMEOUT):
+        self.concurrency = concurrency
+        self.loop = self.semaphore = None
+        # Imported here, since requests run on worker threads that would otherwise race to import it
+        self.http_client = lazy_import('http.client')
+        self.interval = interval
+        self.timeout = timeout
+        self.next_start = {}
+        self.pools = {}
+        self.lock = threading.Lock()
+
+    async def fetch(self, url):
+        asyncio = lazy_import('asyncio')
+        for _ in range(LINK_MAX_REDIRECTS + 1):
+            origin = urllib.parse.urlsplit(url).netloc
+            # Reserve a start time for this host, then wait for it outside the concurrency limit
+            now = time.monotonic()
+            start = max(now, self.next_start.get(origin, now))
+            self.next_start[origin] = start + self.interval
+            await asyncio.sleep(start - now)
+            # Each check runs its own event loop, and a semaphore only works within one
+            if self.loop is not asyncio.get_running_loop():
+                self.loop = asyncio.get_running_loop()
+                self.semaphore = asyncio.Semaphore(self.concurrency)
+            async with self.semaphore:
+                status, location = await asyncio.to_thread(self.request, url)
+            if status not in (301, 302, 303, 307, 308) or not location:
+                return status
+            url = urllib.parse.urljoin(url, location)
+        raise OSError(f"more than {LINK_MAX_REDIRECTS} redirects")
+
+    # Function to send one request on a pooled connection. Servers that reject HEAD are asked with GET, whose
+    # body is not downloaded. Returns the status and the Location header.
+    def request(self, url):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise OSError(f"unsupported URL scheme '{parts.scheme}'")
+        origin = (parts.scheme, parts.netloc)
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        method = 'HEAD'
+        while True:
+            connection, reused = self.acquire(origin)
+            try:
+                connection.request(method, target, headers={'User-Agent': LINK_USER_AGENT})
+                response = connection.getresponse()
+                if method == 'HEAD':
+                    response.read()
+            except (OSError, self.http_client.HTTPException) as e:
+                connection.close()
+                if reused:
+                    # The server closed the idle connection; retry on another one
+                    continue
+                raise OSError(str(e) or type(e).__name__) from e
+            if method == 'GET' or response.will_close:
+                connection.close()
+            else:
+                self.release(origin, connection)
+            if method == 'HEAD' and response.status >= 400:
+                method = 'GET'
+                continue
+            return response.status, response.getheader('Location')
+
+    # Function to take an idle connection to `origin` from the pool, or open a new one. Returns the
+    # connection and whether it was reused.
+    def acquire(self, origin):
+        with self.lock:
+            pool = self.pools.setdefault(origin, [])
+            if pool:
+                return pool.pop(), True
+        scheme, netloc = origin
+        connection_class = self.http_client.HTTPSConnection if scheme == 'https' else self.http_client.HTTPConnection
+        return connection_class(netloc, timeout=self.timeout), False
+
+    def release(self, origin, connection):
+        with self.lock:
+            self.pools[origin].append(connection)
+
+    # Function to close every pooled connection
+    def close(self):
+        with self.lock:
+            for pool in self.pools.values():
+                for connection in pool:
+                    connection.close()
+            self.pools.clear()
+
+# Checks external links concurrently through a fetcher and keeps the results in the cache directory. A link
+# that worked is not fetched again for `ttl` seconds; broken links are fetched on every check, so fixes show
+# up at once. Only links passed to the latest check are kept.
+class LinkChecker:
+    def __init__(self, fetcher=None, ttl=LINK_TTL, cache_dir=CACHE_DIR):
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        try:
+            with open(os.path.join(cache_dir, LINK_CACHE_NAME), 'r', encoding='utf-8') as f:
+                self.results = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.results = {}
+
+    # Function to check URLs. Returns a dict mapping each URL to an error message, or None if it works.
+    def check(self, urls):
+        now = time.time()
+        results = {}
+        pending = []
+        for url in sorted(set(urls)):
+            cached = self.results.get(url)
+            if cached and cached['error'] is None and now - cached['checked'] < self.ttl:
+                results[url] = None
+            else:
+                pending.append(url)
+        if pending:
+            fetcher = self.fetcher or HttpFetcher()
+
+            async def check_all():
+                return await lazy_import('asyncio').gather(*(self.check_url(fetcher, url) for url in pending))
+
+            try:
+                errors = lazy_import('asyncio').run(check_all())
+            finally:
+                if fetcher is not self.fetcher:
+                    fetcher.close()
+            for url, error in zip(pending, errors):
+                results[url] = error
+                self.results[url] = {'error': error, 'checked': now}
+        self.results = {url: self.results[url] for url in results}
+        self.save()
+        return results
+
+    async def check_url(self, fetcher, url):
+        try:
+            status = await fetcher.fetch(url)
+        except OSError as e:
+            return str(e) or type(e).__name__
+        return f"HTTP {status}" if status >= 400 else None
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, LINK_CACHE_NAME)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.results, f, indent=1, sort_keys=True)
+        os.replace(path + '.tmp', path)
+
+# Function to check that the files and links a bib file references exist: previews under PREVIEW_DIR and
+# site-relative links under `site_dir` are looked up on disk in parallel, and arXiv, PDF and code URLs go
+# through `checker` (a LinkChecker; None skips them). Returns the problems found and the normalizer's warnings.
+def check_references(bib_path='bibtex.bib', site_dir='.', checker=None):
+    local_files = {}
+    links = {}
+    normalizer = Normalizer(AuthorIndex())
+    with open(bib_path, 'r', encoding='utf-8') as f:
+        for entry in normalizer.normalize(iter_bibtex_entries(f)):
+            if entry.preview:
+                local_files.setdefault(os.path.join(site_dir, PREVIEW_DIR, entry.preview), []).append((entry.ID, 'preview', entry.preview))
+            references = [('arxiv', f"https://arxiv.org/abs/{entry.arxiv}")] if entry.arxiv else []
+            references += [(field, getattr(entry, field)) for field in ('pdf', 'code') if getattr(entry, field)]
+            for field, url in references:
+                if urllib.parse.urlsplit(url).scheme:
+                    links.setdefault(url, []).append((entry.ID, field, url))
+                else:
+                    path = os.path.join(site_dir, urllib.parse.unquote(urllib.parse.urlsplit(url).path).lstrip('/'))
+                    local_files.setdefault(path, []).append((entry.ID, field, url))
+
+    problems = []
+    futures_module = lazy_import('concurrent.futures')
+    with futures_module.ThreadPoolExecutor() as pool:
+        for path, exists in zip(local_files, pool.map(os.path.isfile, local_files)):
+            if not exists:
+                problems += [f"'{entry_id}' {field} '{value}' not found at {path}." for entry_id, field, value in local_files[path]]
+    if checker is not None:
+        for url, error in checker.check(links).items():
+            if error is not None:
+                problems += [f"'{entry_id}' {field} link {url} is broken: {error}." for entry_id, field, _ in links[url]]
+    return problems, normalizer.warnings
+
+# Pushes reload events to browsers connected to the dev server's LIVE_RELOAD_PATH
+class LiveReload:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    # Function to tell every connected browser to reload
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    # Function to wait until a reload newer than `version` is pushed. Returns the latest version.
+    def wait(self, version, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+# Function to create the --watch dev server. It serves the site directory, streams reload events as
+# server-sent events and injects the script that listens for them into HTML pages; built files are never modified.
+def dev_server(port, directory, live_reload):
+    http_server = lazy_import('http.server')
+
+    class DevRequestHandler(http_server.SimpleHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path == LIVE_RELOAD_PATH:
+                self.send_events()
+                return
+            file_path = self.translate_path(path)
+            if os.path.isdir(file_path):
+                file_path = os.path.join(file_path, 'index.html')
+            if file_path.endswith('.html') and os.path.isfile(file_path):
+                self.send_page(file_path)
+                return
+            super().do_GET()
+
+        def send_page(self, file_path):
+            with open(file_path, 'rb') as f:
+                body = f.read()
+            script = f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = () => location.reload();</script>'.encode()
+            position = body.rfind(b'</body>')
+            body = body[:position] + script + body[position:] if position != -1 else body + script
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_events(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            version = live_reload.version
+            try:
+                while True:
+                    latest = live_reload.wait(version, timeout=15)
+                    # Comments keep idle connections open through proxies and reveal closed ones
+                    self.wfile.write(b'data: reload\n\n' if latest != version else b': keep-alive\n\n')
+                    self.wfile.flush()
+                    version = latest
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    handler = functools.partial(DevRequestHandler, directory=directory)
+    return http_server.ThreadingHTTPServer(('127.0.0.1', port), handler)
+
+# Function to get the modification time and size of every file --watch rebuilds or reloads for
+def watched_files(bib_path):
+    files = {}
+    paths = [bib_path, os.path.abspath(__file__)]
+    for directory in (TEMPLATE_DIR, 'assets'):
+        for root, dirs, names in os.walk(directory):
+            paths.extend(os.path.join(root, name) for name in names)
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+# Function to build, serve the site on localhost and rebuild whenever the bib file, the templates or the
+# assets change. The process stays warm, so rebuilds skip start-up and imports and reuse compiled templates
+# and the incremental build cache; connected browsers reload once the rebuild is written.
+def watch(options, profile=DEFAULT_PROFILE, port=8000, bib_path='bibtex.bib', output_path='index.html'):
+    # A service worker would answer reloads from its cache instead of the rebuilt pages
+    options = {**options, 'incremental': True, 'service_worker': False}
+    live_reload = LiveReload()
+    server = dev_server(port, os.path.dirname(os.path.abspath(output_path)), live_reload)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving on http://127.0.0.1:{port}/ and watching for changes (Ctrl+C to stop).")
+
+    files = None
+    try:
+        while True:
+            current = watched_files(bib_path)
+            changed = [path for path in current.keys() | (files or {}).keys() if current.get(path) != (files or {}).get(path)]
+            if files is not None and not changed:
+                time.sleep(WATCH_INTERVAL)
+                continue
+            if files is not None and os.path.abspath(__file__) in changed:
+                # New generator code needs a new process
+                print("gen.py changed, restarting.")
+                server.server_close()
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+            start = time.perf_counter()
+            try:
+                status = build_page(bib_path, output_path, profile=profile, options=options)
+                print(f"'{output_path}': {status} in {(time.perf_counter() - start) * 1000:.0f} ms.")
+            except Exception as e:
+                print(f"Build failed: {e}")
+            # Take in the files the build wrote, so they do not trigger another build
+            files = watched_files(bib_path)
+            live_reload.notify()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+# Function to parse a command-line count that must be at least 1
+def positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+# Function to parse the --formats list of renderer names
+def parse_formats(value):
+    formats = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in formats if name not in RENDERERS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"unknown format(s) {', '.join(unknown) or '(none)'}; choose from {', '.join(RENDERERS)}")
+    return formats
 
 # Main function to convert BibTeX to HTML
 def main():
-    try:
-        # Input BibTeX string
-        with open('bibtex.bib', 'r', encoding='utf-8') as f:
-            bibtex_string = f.read()
-    except FileNotFoundError:
+    arg_parser = argparse.ArgumentParser(description="Generate index.html from bibtex.bib.")
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help=f"Reuse unchanged work from the build cache in '{CACHE_DIR}'.")
+    arg_parser.add_argument('--responsive-images', action='store_true',
+                            help="Resize preview images to AVIF/WebP with srcset and explicit dimensions (needs Pillow).")
+    arg_parser.add_argument('--page-size', type=positive_int, default=None, metavar='N',
+                            help=f"Keep only the first N publications in index.html and move the rest to '{SHARD_DIR}/'.")
+    arg_parser.add_argument('--shard-by', choices=('year', 'size'), default='year',
+                            help="With --page-size, split the remaining publications by year or into pages of N entries.")
+    arg_parser.add_argument('--lazy-citations', action='store_true',
+                            help="Write citations to citations.json and load them when a Cite button is clicked.")
+    arg_parser.add_argument('--search', action='store_true',
+                            help="Write a prebuilt search index to search.json and add search and filters to the pages.")
+    arg_parser.add_argument('--optimize', action='store_true',
+                            help="Minify HTML/CSS/JS, inline only critical CSS and defer the rest and the web fonts.")
+    arg_parser.add_argument('--publish', action='store_true',
+                            help=f"Reference assets by content-hashed copies listed in '{ASSET_MANIFEST_PATH}' and "
+                                 "write .gz/.br siblings of text outputs.")
+    arg_parser.add_argument('--formats', type=parse_formats, default=['html'], metavar='FORMAT,...',
+                            help=f"Outputs to render from one parse of the bib file, concurrently: "
+                                 f"{', '.join(RENDERERS)} (default: html). Besides the page, they write "
+                                 f"{PUBLICATIONS_JSON_PATH}, {PUBLICATIONS_MARKDOWN_PATH} and {PUBLICATIONS_LATEX_PATH}.")
+    arg_parser.add_argument('--service-worker', action='store_true',
+                            help=f"Write a service worker ({SERVICE_WORKER_PATH}) that precaches the pages and caches "
+                                 "preview images, so repeat visits load instantly and work offline.")
+    arg_parser.add_argument('--highlight', action='append', metavar='NAME',
+                            help=f"Bold this author in author lists (repeatable; default: {DEFAULT_PROFILE['name']}).")
+    arg_parser.add_argument('--watch', action='store_true',
+                            help="Serve the site on localhost, rebuild on changes and reload connected browsers.")
+    arg_parser.add_argument('--port', type=int, default=8000,
+                            help="Port of the --watch dev server (default: %(default)s).")
+    arg_parser.add_argument('--check', action='store_true',
+                            help="Check that preview files and site-relative links exist and that arXiv, PDF and "
+                                 "code links work, instead of building.")
+    arg_parser.add_argument('--offline', action='store_true',
+                            help="With --check, only check files on disk.")
+    arg_parser.add_argument('--link-ttl', type=float, default=LINK_TTL, metavar='SECONDS',
+                            help=f"With --check, trust links that worked for this long (default: %(default)s; results "
+                                 f"are kept in '{CACHE_DIR}').")
+    arg_parser.add_argument('-v', '--verbose', action='store_true',
+                            help="Report how long the build and the imports of heavy modules took.")
+    arg_parser.add_argument('--batch', metavar='MANIFEST',
+                            help="Build every page listed in a JSON manifest instead of index.html.")
+    arg_parser.add_argument('--workers', type=positive_int, default=None,
+                            help="Number of worker processes for --batch (default: number of CPUs).")
+    arg_parser.add_argument('--profile', nargs='?', const='-', metavar='PATH',
+                            help="Report time and peak memory per build stage as JSON, to PATH or stdout.")
+    args = arg_parser.parse_args()
+    options = {
+        'incremental': args.incremental,
+        'responsive_images': args.responsive_images,
+        'page_size': args.page_size,
+        'shard_by': args.shard_by,
+        'lazy_citations': args.lazy_citations,
+        'search': args.search,
+        'optimize': args.optimize,
+        'publish': args.publish,
+        'service_worker': args.service_worker,
+        'formats': args.formats,
+    }
+
+    if args.batch:
+        try:
+            succeeded = run_batch(args.batch, args.workers, options)
+        except ValueError as e:
+            print(f"Error: {e}")
+            raise SystemExit(1)
+        if not succeeded:
+            raise SystemExit(1)
+        return
+
+    if not os.path.exists('bibtex.bib'):
         print("Error: 'bibtex.bib' file not found. Please ensure the file exists in the current directory.")
         return
 
-    # Read BibTeX entries from string
-    entries = read_bibtex_string(bibtex_string)
-    # Create the HTML page and save it
-    create_html(entries)
-    print("Successfully generated 'index.html'.")
+    if args.check:
+        checker = None if args.offline else LinkChecker(ttl=args.link_ttl)
+        problems, warnings = check_references(checker=checker)
+        for warning in warnings:
+            print(f"Warning: bibtex.bib: {warning}")
+        for problem in problems:
+            print(f"Error: bibtex.bib: {problem}")
+        if problems:
+            raise SystemExit(1)
+        print("All references in 'bibtex.bib' are valid.")
+        return
+
+    profile = {**DEFAULT_PROFILE, 'highlight': args.highlight} if args.highlight else DEFAULT_PROFILE
+    if args.watch:
+        watch(options, profile, args.port)
+        return
+
+    if args.profile:
+        PROFILER.start()
+    start = time.perf_counter()
+    status = build_page(profile=profile, options=options)
+    if status == "up to date":
+        print("'index.html' is up to date.")
+    elif status == "generated":
+        print("Successfully generated 'index.html'.")
+    else:
+        print("'index.html' is unchanged.")
+    if args.verbose:
+        for name, seconds in IMPORT_TIMES.items():
+            print(f"Imported {name} in {seconds * 1000:.1f} ms.")
+        print(f"Built in {(time.perf_counter() - start) * 1000:.1f} ms"
+              f"{'' if IMPORT_TIMES else ' without importing bibtexparser, jinja2 or markdown'}.")
+    if args.profile:
+        report = {'status': status, **PROFILER.report()}
+        if args.profile == '-':
+            print(json.dumps(report, indent=2))
+        else:
+            with open(args.profile, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
 
 if __name__ == "__main__":
     main()
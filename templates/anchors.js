@@ -0,0 +1,16 @@
+// Publications can live on shard pages: follow a #pub_<ID> link that is not on this page to the page that has it
+document.addEventListener('DOMContentLoaded', () => {
+    const hash = window.location.hash;
+    if (!hash.startsWith('#pub_') || document.getElementById(hash.slice(1))) {
+        return;
+    }
+    fetch('{{ anchors_url }}')
+        .then(response => response.json())
+        .then(anchors => {
+            const page = anchors[decodeURIComponent(hash.slice(5))];
+            if (page && page !== window.location.pathname) {
+                window.location.replace(page + hash);
+            }
+        })
+        .catch(() => {});
+});
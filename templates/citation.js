@@ -0,0 +1,35 @@
+// Citations written to citations.json (--lazy-citations) are fetched once, on the first click
+let citationsRequest = null;
+
+function loadCitation(id, key) {
+    citationsRequest = citationsRequest || fetch('{{ citations_url }}').then(response => response.json());
+    citationsRequest.then(citations => {
+        const citationElement = document.createElement('div');
+        citationElement.id = id;
+        citationElement.className = 'citation-text lazy-citation';
+        citationElement.textContent = citations[key] || '';
+        document.getElementById('pub_' + key).querySelector('.entry-content').appendChild(citationElement);
+        toggleCitation(id);
+    });
+}
+
+function toggleCitation(id, key) {
+    const citationElement = document.getElementById(id);
+    if (!citationElement) {
+        loadCitation(id, key);
+        return;
+    }
+    const allCitations = document.querySelectorAll('.citation-text');
+
+    allCitations.forEach(citation => {
+        if (citation.id !== id) {
+            citation.style.display = "none";
+        }
+    });
+
+    if (citationElement.style.display === "none" || citationElement.style.display === "") {
+        citationElement.style.display = "block";
+    } else {
+        citationElement.style.display = "none";
+    }
+}
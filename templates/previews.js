@@ -0,0 +1,25 @@
+// Start animated previews only while they are on screen: videos play and pause, animated WebPs
+// replace their poster frame the first time they scroll into view.
+document.addEventListener('DOMContentLoaded', () => {
+    const previews = document.querySelectorAll('.animated-preview');
+    if (!('IntersectionObserver' in window)) {
+        previews.forEach(preview => preview.tagName === 'VIDEO' ? preview.play() : (preview.src = preview.dataset.animatedSrc));
+        return;
+    }
+    const observer = new IntersectionObserver(items => {
+        items.forEach(item => {
+            const preview = item.target;
+            if (preview.tagName === 'VIDEO') {
+                if (item.isIntersecting) {
+                    preview.play().catch(() => {});
+                } else {
+                    preview.pause();
+                }
+            } else if (item.isIntersecting) {
+                preview.src = preview.dataset.animatedSrc;
+                observer.unobserve(preview);
+            }
+        });
+    }, {rootMargin: '200px'});
+    previews.forEach(preview => observer.observe(preview));
+});
@@ -0,0 +1,4 @@
+// Register the service worker once the page has loaded, so it does not compete with the first paint
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => navigator.serviceWorker.register('{{ service_worker_url }}'));
+}
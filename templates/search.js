@@ -0,0 +1,124 @@
+// Search and filters over the prebuilt index in search.json (--search). The index is fetched the first time the
+// search box is used; matching entries are found in the index and only entries of this page are shown or hidden.
+let searchRequest = null;
+let searchIndex = null;
+
+function normalizeSearchText(text) {
+    return text.normalize('NFKD').replace(/[\u0300-\u036f]/g, '').replace(/\u0131/g, 'i').toLowerCase()
+        .replace(/[^\p{L}\p{N}_\s]/gu, ' ').split(/\s+/).filter(token => token);
+}
+
+// Postings are delta-encoded lists of document numbers
+function decodePostings(deltas) {
+    let doc = 0;
+    return deltas.map(delta => doc += delta);
+}
+
+function loadSearchIndex() {
+    searchRequest = searchRequest || fetch('{{ search_url }}')
+        .then(response => response.json())
+        .then(index => {
+            const facet = postings => postings.map(([label, deltas]) => [label, decodePostings(deltas)]);
+            const terms = Object.keys(index.terms).sort();
+            searchIndex = {
+                ...index,
+                terms: terms,
+                postings: terms.map(term => decodePostings(index.terms[term])),
+                years: facet(index.years),
+                venues: facet(index.venues),
+                authors: facet(index.authors),
+                stopwords: new Set(index.stopwords),
+                elements: new Map(),
+            };
+            for (const name of ['years', 'venues', 'authors']) {
+                const select = document.getElementById('search-' + name.slice(0, -1));
+                searchIndex[name].forEach(([label, docs], i) => select.add(new Option(`${label} (${docs.length})`, i)));
+            }
+            return searchIndex;
+        });
+    return searchRequest;
+}
+
+// Documents with a term starting with `token`, found by binary search over the sorted terms
+function searchPrefix(token) {
+    const terms = searchIndex.terms;
+    let low = 0, high = terms.length;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (terms[middle] < token) low = middle + 1; else high = middle;
+    }
+    const docs = new Set();
+    for (let i = low; i < terms.length && terms[i].startsWith(token); i++) {
+        searchIndex.postings[i].forEach(doc => docs.add(doc));
+    }
+    return docs;
+}
+
+function currentSearchPage() {
+    const path = window.location.pathname;
+    return path.endsWith('/index.html') ? path.slice(0, -'index.html'.length) : path;
+}
+
+function runSearch() {
+    if (!searchIndex) {
+        loadSearchIndex().then(runSearch);
+        return;
+    }
+    let matches = null;
+    const restrict = docs => {
+        matches = matches === null ? new Set(docs) : new Set([...docs].filter(doc => matches.has(doc)));
+    };
+    // Stopwords are not indexed, so they could never match
+    normalizeSearchText(document.getElementById('search-query').value)
+        .filter(token => !searchIndex.stopwords.has(token))
+        .forEach(token => restrict(searchPrefix(token)));
+    for (const name of ['years', 'venues', 'authors']) {
+        const value = document.getElementById('search-' + name.slice(0, -1)).value;
+        if (value !== '') {
+            restrict(searchIndex[name][value][1]);
+        }
+    }
+
+    const page = searchIndex.pages.indexOf(currentSearchPage());
+    const elsewhere = [];
+    let shown = 0;
+    searchIndex.docs.forEach(([id, docPage, title], doc) => {
+        const match = matches === null || matches.has(doc);
+        if (docPage !== page) {
+            if (match && matches !== null) elsewhere.push([id, searchIndex.pages[docPage], title]);
+            return;
+        }
+        if (!searchIndex.elements.has(id)) {
+            searchIndex.elements.set(id, document.getElementById('pub_' + id));
+        }
+        const element = searchIndex.elements.get(id);
+        if (element) {
+            element.hidden = !match;
+            shown += match;
+        }
+    });
+
+    const status = document.getElementById('search-status');
+    status.textContent = matches === null ? '' :
+        `${shown} matching publication${shown === 1 ? '' : 's'} on this page` +
+        (elsewhere.length ? `, ${elsewhere.length} on other pages:` : '');
+    const list = document.getElementById('search-elsewhere');
+    list.replaceChildren(...elsewhere.slice(0, 20).map(([id, docPage, title]) => {
+        const item = document.createElement('li');
+        const link = document.createElement('a');
+        link.href = `${docPage}#pub_${id}`;
+        link.textContent = title;
+        item.appendChild(link);
+        return item;
+    }));
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    const search = document.querySelector('.search');
+    if (!search) {
+        return;
+    }
+    // Start loading the index as soon as the visitor heads for the search box
+    ['pointerenter', 'focusin'].forEach(type => search.addEventListener(type, loadSearchIndex, {once: true}));
+    search.addEventListener('input', runSearch);
+});
@@ -0,0 +1,134 @@
+{% if manifest_version -%}
+// Generated by gen.py (--service-worker). Files in the manifest's "precache" list are cached when the worker
+// installs, keyed by revision, so an updated worker only downloads files whose revision changed. Preview
+// images and web fonts are served stale-while-revalidate; cached images whose revision changed are dropped
+// on activation.
+const MANIFEST_URL = '{{ manifest_url }}';
+const MANIFEST_VERSION = '{{ manifest_version }}';
+const PRECACHE = 'precache';
+const IMAGES = 'images';
+const FONT_ORIGINS = ['https://fonts.googleapis.com', 'https://fonts.gstatic.com'];
+
+const revisionKey = entry => entry.url + (entry.url.includes('?') ? '&' : '?') + '__revision=' + entry.revision;
+const manifestKey = version => new URL(MANIFEST_URL + '?v=' + version, location).href;
+
+async function readManifest(cache, key) {
+    const response = await cache.match(key);
+    return response ? response.json() : {precache: [], images: []};
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const response = await fetch(manifestKey(MANIFEST_VERSION), {cache: 'no-cache'});
+        if (!response.ok) {
+            throw new Error('Precache manifest unavailable');
+        }
+        const manifest = await response.clone().json();
+        const cache = await caches.open(PRECACHE);
+        await Promise.all(manifest.precache.map(async entry => {
+            const key = revisionKey(entry);
+            if (await cache.match(key)) {
+                return;
+            }
+            const fileResponse = await fetch(entry.url, {cache: 'no-cache'});
+            if (!fileResponse.ok) {
+                throw new Error('Failed to precache ' + entry.url);
+            }
+            await cache.put(key, fileResponse);
+        }));
+        await cache.put(manifestKey(MANIFEST_VERSION), response);
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(PRECACHE);
+        const manifest = await readManifest(cache, manifestKey(MANIFEST_VERSION));
+        const current = new Set(manifest.precache.map(revisionKey));
+        current.add(manifestKey(MANIFEST_VERSION));
+        const imageRevisions = new Map(manifest.images.map(entry => [entry.url, entry.revision]));
+        const images = await caches.open(IMAGES);
+        for (const request of await cache.keys()) {
+            const url = new URL(request.url);
+            if (url.pathname === MANIFEST_URL && request.url !== manifestKey(MANIFEST_VERSION)) {
+                // Images whose revision changed since the previous manifest are stale
+                const previous = await readManifest(cache, request);
+                await Promise.all(previous.images
+                    .filter(entry => imageRevisions.get(entry.url) !== entry.revision)
+                    .map(entry => images.delete(entry.url)));
+            }
+            if (!current.has(request.url)) {
+                await cache.delete(request);
+            }
+        }
+        await self.clients.claim();
+    })());
+});
+
+let routes = null;
+
+// Function to map the manifest's URLs to their precache keys and to the set of preview images
+function readRoutes() {
+    routes = routes || caches.open(PRECACHE)
+        .then(cache => readManifest(cache, manifestKey(MANIFEST_VERSION)))
+        .then(manifest => ({
+            precache: new Map(manifest.precache.map(entry => [entry.url, revisionKey(entry)])),
+            images: new Set(manifest.images.map(entry => entry.url)),
+        }));
+    return routes;
+}
+
+async function staleWhileRevalidate(event) {
+    const cache = await caches.open(IMAGES);
+    const cached = await cache.match(event.request);
+    const network = fetch(event.request).then(response => {
+        if (response.status === 200 || response.type === 'opaque') {
+            cache.put(event.request, response.clone());
+        }
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(network.catch(() => {}));
+        return cached;
+    }
+    return network;
+}
+
+async function respond(event) {
+    const {precache, images} = await readRoutes();
+    const url = new URL(event.request.url);
+    const key = precache.get(url.pathname === '/index.html' ? '/' : url.pathname);
+    const cached = key && await caches.match(key, {cacheName: PRECACHE});
+    if (cached) {
+        return cached;
+    }
+    return images.has(url.pathname) ? staleWhileRevalidate(event) : fetch(event.request);
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    // Range requests (video seeking) get partial responses, which cannot be cached
+    if (request.method !== 'GET' || request.headers.has('range')) {
+        return;
+    }
+    const url = new URL(request.url);
+    if (FONT_ORIGINS.includes(url.origin)) {
+        event.respondWith(staleWhileRevalidate(event));
+    } else if (url.origin === location.origin && url.pathname !== MANIFEST_URL) {
+        event.respondWith(respond(event));
+    }
+});
+{% else -%}
+// Generated by gen.py. The site no longer uses a service worker: drop its caches and unregister, so pages
+// load from the network
+self.addEventListener('install', () => self.skipWaiting());
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const keys = await caches.keys();
+        await Promise.all(keys.map(key => caches.delete(key)));
+        await self.registration.unregister();
+    })());
+});
+{% endif %}
@@ -0,0 +1,102 @@
+import http.server
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gen
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):
+        self.respond(include_body=False)
+
+    def do_GET(self):
+        self.respond(include_body=True)
+
+    def respond(self, include_body):
+        self.server.requests.append((self.command, self.path))
+        if self.path == '/nohead' and self.command == 'HEAD':
+            self.reply(405, include_body)
+        elif self.path in ('/ok', '/nohead'):
+            self.reply(200, include_body)
+        elif self.path == '/moved':
+            self.reply(301, include_body, location='/ok')
+        elif self.path == '/loop':
+            self.reply(302, include_body, location='/loop')
+        else:
+            self.reply(404, include_body)
+
+    def reply(self, status, include_body, location=None):
+        body = b'stub'
+        self.send_response(status)
+        if location:
+            self.send_header('Location', location)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def closed_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def test_link_checker_against_stub_server(stub, tmp_path):
+    base = f"http://127.0.0.1:{stub.server_address[1]}"
+    refused = f"http://127.0.0.1:{closed_port()}/ok"
+    urls = [f"{base}/ok", f"{base}/missing", f"{base}/loop", f"{base}/nohead", f"{base}/moved", refused]
+    # A low concurrency makes requests wait on the semaphore, in both runs of the same fetcher
+    fetcher = gen.HttpFetcher(concurrency=1, interval=0, timeout=5)
+    try:
+        results = gen.LinkChecker(fetcher, ttl=3600, cache_dir=tmp_path).check(urls)
+        assert results[f"{base}/ok"] is None
+        assert results[f"{base}/nohead"] is None
+        assert results[f"{base}/moved"] is None
+        assert results[f"{base}/missing"] == 'HTTP 404'
+        assert results[f"{base}/loop"] == f"more than {gen.LINK_MAX_REDIRECTS} redirects"
+        assert results[refused] is not None
+        assert ('GET', '/nohead') in stub.requests
+
+        # A second run, from the saved cache, only asks again for the links that were broken
+        stub.requests.clear()
+        again = gen.LinkChecker(fetcher, ttl=3600, cache_dir=tmp_path).check(urls)
+        assert again == results
+        assert {path for _, path in stub.requests} == {'/missing', '/loop'}
+    finally:
+        fetcher.close()
+
+
+def test_expired_results_are_checked_again(stub, tmp_path):
+    url = f"http://127.0.0.1:{stub.server_address[1]}/ok"
+    fetcher = gen.HttpFetcher(interval=0, timeout=5)
+    try:
+        assert gen.LinkChecker(fetcher, ttl=0, cache_dir=tmp_path).check([url]) == {url: None}
+        stub.requests.clear()
+        assert gen.LinkChecker(fetcher, ttl=0, cache_dir=tmp_path).check([url]) == {url: None}
+        assert stub.requests == [('HEAD', '/ok')]
+    finally:
+        fetcher.close()
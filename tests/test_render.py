@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gen
+
+
+class CollectingRenderer(gen.Renderer):
+    name = 'collect'
+
+    def render(self, entries):
+        self.entries = list(entries)
+        return True
+
+
+class FailingRenderer(gen.Renderer):
+    name = 'fail'
+
+    def render(self, entries):
+        for position, _ in enumerate(entries):
+            if position == 3:
+                raise ValueError("renderer failed")
+        return True
+
+
+class EarlyExitRenderer(gen.Renderer):
+    name = 'early'
+
+    def render(self, entries):
+        next(entries)
+        return False
+
+
+def make(renderer_class):
+    return renderer_class('index.html', None, gen.ABOUT_MARKDOWN, gen.DEFAULT_PROFILE, gen.DEFAULT_OPTIONS)
+
+
+# Runs render_concurrently on a thread, so a deadlock fails the test instead of hanging it
+def render_with_timeout(renderers, entries, timeout=10):
+    outcome = {}
+
+    def run():
+        try:
+            outcome['result'] = gen.render_concurrently(renderers, entries)
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "render_concurrently deadlocked"
+    return outcome
+
+
+def test_all_renderers_see_every_record():
+    renderers = [make(CollectingRenderer), make(CollectingRenderer)]
+    outcome = render_with_timeout(renderers, iter(range(5000)))
+    assert outcome == {'result': True}
+    assert all(renderer.entries == list(range(5000)) for renderer in renderers)
+
+
+def test_failing_first_renderer_does_not_deadlock():
+    worker = make(CollectingRenderer)
+    outcome = render_with_timeout([make(FailingRenderer), worker], iter(range(100)))
+    assert isinstance(outcome['error'], ValueError)
+    assert not hasattr(worker, 'entries')
+
+
+def test_failing_worker_renderer_is_reported():
+    first = make(CollectingRenderer)
+    outcome = render_with_timeout([first, make(FailingRenderer)], iter(range(gen.RENDER_QUEUE_SIZE * 3)))
+    assert isinstance(outcome['error'], ValueError)
+    assert len(first.entries) == gen.RENDER_QUEUE_SIZE * 3
+
+
+def test_worker_renderer_that_stops_early_does_not_block_the_stream():
+    outcome = render_with_timeout([make(CollectingRenderer), make(EarlyExitRenderer)], iter(range(gen.RENDER_QUEUE_SIZE * 3)))
+    assert outcome == {'result': True}
+
+
+def test_failing_stream_stops_every_renderer():
+    def entries():
+        yield from range(10)
+        raise OSError("bib file went away")
+
+    outcome = render_with_timeout([make(CollectingRenderer), make(CollectingRenderer)], entries())
+    assert isinstance(outcome['error'], OSError)
+
+
+BIB = r"""
+@inproceedings{muller2024fast,
+  title={Fast_tokens & 100% recall: #1 on {C++} with *stars* [and] ~tilde^ $5},
+  author={Doe, Jane and M{\"u}ller, J{\"u}rgen and others},
+  booktitle={Workshop on {Under_scores} & Friends},
+  year={2024},
+  arxiv={2401.01234},
+  pdf={https://example.org/paper (v2)%20final.pdf#page=2},
+  code={https://github.com/example/fast_tokens}
+}
+
+@article{doe2023plain,
+  title={A plain title},
+  author={Doe, Jane},
+  year={2023}
+}
+"""
+
+
+def test_formats_render_and_escape_one_bib(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'bibtex.bib').write_text(BIB, encoding='utf-8')
+    profile = {**gen.DEFAULT_PROFILE, 'name': 'Jürgen Müller'}
+    status = gen.build_page('bibtex.bib', 'index.html', profile=profile, options={'formats': ['json', 'markdown', 'latex']})
+    assert status == 'generated'
+    assert not (tmp_path / 'index.html').exists()
+
+    data = json.loads((tmp_path / gen.PUBLICATIONS_JSON_PATH).read_text(encoding='utf-8'))
+    first, second = data['publications']
+    assert first['title'] == 'Fast_tokens & 100% recall: #1 on C++ with *stars* [and] ~tilde^ $5'
+    assert first['authors'] == ['Jane Doe', 'Jürgen Müller']
+    assert first['highlighted'] == ['Jürgen Müller']
+    assert first['venue'] == 'Workshop on Under_scores & Friends'
+    assert second['venue'] is None and second['journal'] is None
+    assert [(author['name'], author['publications'], author['highlighted']) for author in data['authors']] == [
+        ('Jane Doe', 2, False), ('Jürgen Müller', 1, True)]
+
+    markdown = (tmp_path / gen.PUBLICATIONS_MARKDOWN_PATH).read_text(encoding='utf-8').splitlines()
+    assert markdown[0] == '# Publications of Jürgen Müller'
+    assert markdown[2:] == [
+        r'- **Fast\_tokens & 100% recall: \#1 on C++ with \*stars\* \[and\] ~tilde^ $5**. Jane Doe, **Jürgen Müller**, '
+        r'et al. *Workshop on Under\_scores & Friends*, 2024. [arXiv](https://arxiv.org/abs/2401.01234) '
+        r'[PDF](https://example.org/paper%20%28v2%29%20final.pdf#page=2) [Code](https://github.com/example/fast_tokens)',
+        '- **A plain title**. Jane Doe. 2023.',
+    ]
+
+    latex = (tmp_path / gen.PUBLICATIONS_LATEX_PATH).read_text(encoding='utf-8').splitlines()
+    assert latex[3:] == [
+        r'    \item \textbf{Fast\_tokens \& 100\% recall: \#1 on C++ with *stars* [and] \textasciitilde{}tilde'
+        r'\textasciicircum{} \$5}. Jane Doe, \textbf{Jürgen Müller}, et al. \textit{Workshop on Under\_scores \& Friends}, '
+        r'2024. \href{https://arxiv.org/abs/2401.01234}{arXiv} \href{https://example.org/paper (v2)\%20final.pdf\#page=2}{PDF} '
+        r'\href{https://github.com/example/fast_tokens}{Code}',
+        r'    \item \textbf{A plain title}. Jane Doe. 2023.',
+        r'\end{enumerate}',
+    ]
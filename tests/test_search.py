@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gen
+
+BIB = r"""
+@article{steiner2021train,
+  title={How to train your {ViT}? data, augmentation, and regularization in vision transformers},
+  author={Steiner, Andreas and Kolesnikov, Alexander and Zhai, Xiaohua and Wightman, Ross and Uszkoreit, Jakob and Beyer, Lucas},
+  journal={Transactions on Machine Learning Research},
+  year={2022}
+}
+
+@inproceedings{dehghani2023scaling,
+  title={Scaling vision transformers to 22 billion parameters},
+  author={Dehghani, Mostafa and Djolonga, Josip and others},
+  booktitle={International Conference on Machine Learning},
+  year={2023}
+}
+
+@inproceedings{zhai2019s4l,
+  title={{S4L}: Self-supervised semi-supervised learning},
+  author={Zhai, Xiaohua and Oliver, Avital and Kolesnikov, Alexander and Beyer, Lucas},
+  booktitle={International Conference on Computer Vision},
+  year={2019}
+}
+"""
+
+# Runs search.js with just enough of a DOM for runSearch(), typing each query into the search box and
+# reporting which entries stay shown
+HARNESS = r"""
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const elements = {};
+for (const id of input.ids) elements['pub_' + id] = {hidden: false};
+const select = () => ({value: '', add() {}});
+Object.assign(elements, {
+    'search-query': {value: ''}, 'search-year': select(), 'search-venue': select(), 'search-author': select(),
+    'search-status': {}, 'search-elsewhere': {replaceChildren() {}},
+});
+globalThis.document = {getElementById: id => elements[id], addEventListener() {}, createElement: () => ({appendChild() {}})};
+globalThis.window = {location: {pathname: '/'}};
+globalThis.fetch = async () => ({json: async () => input.index});
+globalThis.Option = function () {};
+require('vm').runInThisContext(input.script);
+(async () => {
+    await loadSearchIndex();
+    const shown = {};
+    for (const query of input.queries) {
+        elements['search-query'].value = query;
+        runSearch();
+        shown[query] = input.ids.filter(id => !elements['pub_' + id].hidden);
+    }
+    console.log(JSON.stringify(shown));
+})();
+"""
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs Node.js to run search.js")
+def test_queries_match_titles_typed_in_full(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'bibtex.bib').write_text(BIB, encoding='utf-8')
+    gen.build_page(str(tmp_path / 'bibtex.bib'), str(tmp_path / 'index.html'), options={'search': True})
+    index = json.loads((tmp_path / 'search.json').read_text(encoding='utf-8'))
+    queries = [
+        'How to train your ViT',
+        'Scaling vision transformers to 22 billion',
+        'S4L: Self-supervised semi-supervised learning',
+        'vision transformers',
+        'kolesnikov self-sup',
+        'the of and',
+        'transformers s4l',
+    ]
+    script = gen.load_template('search.js').render(search_url='/search.json')
+    process = subprocess.run(['node', '-e', HARNESS], input=json.dumps({
+        'script': script, 'index': index, 'queries': queries, 'ids': [doc[0] for doc in index['docs']],
+    }), capture_output=True, text=True, timeout=60, check=True)
+    shown = json.loads(process.stdout)
+    assert shown == {
+        'How to train your ViT': ['steiner2021train'],
+        'Scaling vision transformers to 22 billion': ['dehghani2023scaling'],
+        'S4L: Self-supervised semi-supervised learning': ['zhai2019s4l'],
+        'vision transformers': ['steiner2021train', 'dehghani2023scaling'],
+        'kolesnikov self-sup': ['zhai2019s4l'],
+        # A query of stopwords alone filters nothing
+        'the of and': ['steiner2021train', 'dehghani2023scaling', 'zhai2019s4l'],
+        'transformers s4l': [],
+    }